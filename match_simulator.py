@@ -1,11 +1,14 @@
 #!/usr/bin/env python
 
 import json
+import select
 import shutil
 from signal import SIGKILL
 import subprocess
 import sys
 import os
+import threading
+import time
 from typing import Tuple
 
 NUM_PLAYERS = 4
@@ -13,6 +16,9 @@ PIPE_PERMISSIONS = 0o660
 FILE_PERMISSIOSN = 0o664
 DIRECTORY_PERMISSIONS = 0o775
 
+# Time a pooled bot has to finish up once its match engine has exited
+WORKER_READY_TIMEOUT_SECONDS = 5
+
 
 def main():
     # python3 match_simulator.py --submissions 3:example_submissions/example.py 2:example_submissions/example2.py --engine
@@ -36,7 +42,15 @@ def main():
     if "--engine" in commands:
         if len(commands["--engine"]) != 0:
             print_usage()
-        start_engine()
+
+        seed = None
+        if "--seed" in commands:
+            try:
+                (seed,) = [int(x) for x in commands["--seed"]]
+            except ValueError:
+                print_usage()
+
+        start_engine(seed=seed)
 
     else:
         print(
@@ -67,7 +81,7 @@ def parse_cmd_args(args: list[str]):
         commands[current_command].append(arg)
 
     for command in commands.keys():
-        if command not in ["--submissions", "--engine"]:
+        if command not in ["--submissions", "--engine", "--seed"]:
             print_usage()
 
     return commands
@@ -82,6 +96,8 @@ def print_usage():
         "                                                       will not be automatically started.\n"
         "       --engine                                    If present, the simulator will start the engine. To run the match without this flag you need to manually\n"
         "                                                       start the engine (for example, while debugging it).\n"
+        "       --seed <seed>                               Seeds the tile draws and turn order of the engine started with --engine, every\n"
+        "                                                       match also records its seed in output/results.json and output/game.json.\n"
         "\n"
         "   examples:\n"
         "       python3 match_simulator.py --submissions 5:example_submissions/complex.py --engine\n"
@@ -91,11 +107,11 @@ def print_usage():
     sys.exit(0)
 
 
-def setup_environments(sources: list[Tuple[int, str]]):
-    shutil.rmtree("output", ignore_errors=True)
-    os.mkdir("output")
-    shutil.rmtree("input", ignore_errors=True)
-    os.mkdir("input")
+def setup_environments(sources: list[Tuple[int, str]], directory: str = "."):
+    shutil.rmtree(f"{directory}/output", ignore_errors=True)
+    os.mkdir(f"{directory}/output")
+    shutil.rmtree(f"{directory}/input", ignore_errors=True)
+    os.mkdir(f"{directory}/input")
 
     count = 0
     source = sources.pop(0)
@@ -104,49 +120,152 @@ def setup_environments(sources: list[Tuple[int, str]]):
             count = 0
             source = sources.pop(0)
 
-        clean_environment_for_player(player)
-        setup_environment_for_player(player, source[1])
+        clean_environment_for_player(player, directory)
+        setup_environment_for_player(player, source[1], directory)
 
         count += 1
 
     catalog = [{"team_id": i} for i in range(NUM_PLAYERS)]
-    with open("input/catalog.json", "w") as f:
+    with open(f"{directory}/input/catalog.json", "w") as f:
         f.write(json.dumps(catalog))
 
 
-def start_submissions() -> list[int]:
+def start_submissions(directory: str = ".", verbose: bool = True) -> list[int]:
     player_pids = []
     for player in range(NUM_PLAYERS):
-        os.chdir(f"submission{player}")
+        player_directory = f"{directory}/submission{player}"
 
         with (
-            open("io/submission.log", "w") as f_log,
-            open("io/submission.err", "w") as f_err,
+            open(f"{player_directory}/io/submission.log", "w") as f_log,
+            open(f"{player_directory}/io/submission.err", "w") as f_err,
         ):
             process = subprocess.Popen(
-                ["python3", "submission.py"], stdout=f_log, stderr=f_err
+                ["python3", "submission.py"],
+                stdout=f_log,
+                stderr=f_err,
+                cwd=player_directory,
             )
 
         player_pids.append(process.pid)
-        print(f"[simulator]: started submission {player} (pid={process.pid}).")
-        os.chdir("..")
+        if verbose:
+            print(f"[simulator]: started submission {player} (pid={process.pid}).")
 
     return player_pids
 
 
-def start_engine():
-    print("[simulator] started engine.")
+class BotPool:
+    """
+    Warm bot processes by submission source, reused across matches instead of
+    starting python3 submission.py for each one. Workers run helper.worker and are
+    handed a new game message with their player directory for every match.
+    """
+
+    def __init__(self):
+        self._idle: dict[str, list[subprocess.Popen]] = {}
+        self._lock = threading.Lock()
+
+    def start_submissions(
+        self, sources: list[str], directory: str = "."
+    ) -> list[subprocess.Popen]:
+        workers = []
+        for player, source in enumerate(sources):
+            worker = self._take(source)
+
+            player_directory = os.path.abspath(f"{directory}/submission{player}")
+            worker.stdin.write(json.dumps({"directory": player_directory}) + "\n")
+            worker.stdin.flush()
+
+            workers.append(worker)
+
+        return workers
+
+    def release(self, sources: list[str], workers: list[subprocess.Popen]):
+        """
+        Returns the workers of a finished match, workers that do not get ready in
+        time are killed rather than reused. All of them share one deadline
+        """
+        deadline = time.monotonic() + WORKER_READY_TIMEOUT_SECONDS
+        pending = {
+            worker.stdout: (source, worker) for source, worker in zip(sources, workers)
+        }
+
+        while pending:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            ready, _, _ = select.select(list(pending), [], [], timeout)
+
+            for stdout in ready:
+                source, worker = pending.pop(stdout)
+
+                if stdout.readline():
+                    with self._lock:
+                        self._idle.setdefault(source, []).append(worker)
+                else:
+                    BotPool._kill(worker)
+
+        for _, worker in pending.values():
+            BotPool._kill(worker)
+
+    def close(self):
+        with self._lock:
+            for workers in self._idle.values():
+                for worker in workers:
+                    BotPool._kill(worker)
+
+            self._idle.clear()
+
+    def _take(self, source: str) -> subprocess.Popen:
+        with self._lock:
+            idle = self._idle.get(source)
+            if idle:
+                return idle.pop()
+
+        return subprocess.Popen(
+            ["python3", "-m", "helper.worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+    @staticmethod
+    def _kill(worker: subprocess.Popen):
+        try:
+            worker.kill()
+            worker.wait()
+        except ProcessLookupError:
+            pass
+
+
+def start_engine(directory: str = ".", verbose: bool = True, seed: int | None = None):
+    if verbose:
+        print("[simulator] started engine.")
+
+    seed_args = [] if seed is None else ["--seed", str(seed)]
+
     with (
-        open("output/engine.log", "w") as f_log,
-        open("output/engine.err", "w") as f_err,
+        open(f"{directory}/output/engine.log", "w") as f_log,
+        open(f"{directory}/output/engine.err", "w") as f_err,
     ):
+        if not verbose:
+            subprocess.run(
+                ["python3", "-m", "engine", *seed_args],
+                stdout=f_log,
+                stderr=f_err,
+                cwd=directory,
+            )
+            return
+
         process = subprocess.Popen(
-            ["python3", "-m", "engine", "--print-recording-interactive"],
+            ["python3", "-m", "engine", "--print-recording-interactive", *seed_args],
             stdout=subprocess.PIPE,
             stderr=f_err,
             text=True,
             universal_newlines=True,
             bufsize=1,
+            cwd=directory,
         )
 
         while True:
@@ -160,15 +279,16 @@ def start_engine():
     print("[simulator] engine terminated.")
 
 
-def setup_environment_for_player(player: int, source: str):
-    os.makedirs(f"submission{player}/io", mode=DIRECTORY_PERMISSIONS)
-    os.mkfifo(f"submission{player}/io/to_engine.pipe", mode=PIPE_PERMISSIONS)
-    os.mkfifo(f"submission{player}/io/from_engine.pipe", mode=PIPE_PERMISSIONS)
-    shutil.copy(source, f"submission{player}/submission.py")
+def setup_environment_for_player(player: int, source: str, directory: str = "."):
+    player_directory = f"{directory}/submission{player}"
+    os.makedirs(f"{player_directory}/io", mode=DIRECTORY_PERMISSIONS)
+    os.mkfifo(f"{player_directory}/io/to_engine.pipe", mode=PIPE_PERMISSIONS)
+    os.mkfifo(f"{player_directory}/io/from_engine.pipe", mode=PIPE_PERMISSIONS)
+    shutil.copy(source, f"{player_directory}/submission.py")
 
 
-def clean_environment_for_player(player: int):
-    shutil.rmtree(f"submission{player}", ignore_errors=True)
+def clean_environment_for_player(player: int, directory: str = "."):
+    shutil.rmtree(f"{directory}/submission{player}", ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,21 @@
 import sys
 
 from engine.game_engine import GameEngine
+from engine.interface.logging.replay import Replay
 
-game = GameEngine(len(sys.argv) > 1 and sys.argv[1] == "--print-recording-interactive")
-game.start()
+# python3 -m engine [--print-recording-interactive] [--seed <seed>]
+# python3 -m engine --replay <game.json>
+args = sys.argv[1:]
+
+if "--replay" in args:
+    replay = Replay.from_file(args[args.index("--replay") + 1])
+    print(replay.run().model_dump_json())
+
+    if not replay.matches_recording():
+        sys.exit("The replay diverged from the recording.")
+
+else:
+    seed = int(args[args.index("--seed") + 1]) if "--seed" in args else None
+
+    game = GameEngine("--print-recording-interactive" in args, seed=seed)
+    game.start()
@@ -7,10 +7,19 @@ CORE_DIRECTORY = (
     else "."
 )
 
-OPEN_PIPE_TIMEOUT_SECONDS = 3
-TIMEOUT_SECONDS = 2
+# Time budgets in milliseconds, measured on the monotonic clock
+OPEN_PIPE_TIMEOUT_MS = 3000
+OPEN_PIPE_POLL_MS = 5
+TIMEOUT_MS = 2000
 
-CUMULATIVE_TIMEOUT_SECONDS = 8
+CUMULATIVE_TIMEOUT_MS = 8000
 MAX_CHARACTERS_READ = 4096
-READ_CHUNK_SIZE = 1024
 PIPE_LEN_DELIM = ","
+
+# Messages go through a shared memory ring per pipe when set to "shared_memory",
+# the pipes then only signal that a message is waiting
+SHARED_MEMORY_TRANSPORT = (
+    os.environ.get("GAME_ENGINE_TRANSPORT", "pipe") == "shared_memory"
+)
+# Bytes the engine's ring to each bot holds, queries are one message at a time
+FROM_ENGINE_RING_CAPACITY = 1 << 20
@@ -1,4 +1,5 @@
 from lib.interact.tile import Tile
+from lib.interact.board import GridType
 from lib.config.scoring import MONASTARY_POINTS
 from lib.config.map_config import MAX_MAP_LENGTH
 
@@ -54,7 +55,7 @@ class MonastaryNeighbourSubsciber(TileSubsciber):
         return False
 
     def register_to(
-        self, publisher: "TilePublisherBus", grid: list[list["Tile | None"]] = list()
+        self, publisher: "TilePublisherBus", grid: GridType = list()
     ) -> None:
         for x, y in self._watching():
             assert len(grid) == MAX_MAP_LENGTH
@@ -84,17 +85,9 @@ class MonastaryNeighbourSubsciber(TileSubsciber):
 
 
 class TilePublisherBus:
-    _singleton: "TilePublisherBus | None" = None
-
     def __init__(self) -> None:
         self.watchers: dict[tuple[int, int], list[TileSubsciber]] = {}
 
-    def __new__(cls) -> "TilePublisherBus":
-        if cls._singleton is None:
-            cls._singleton = super().__new__(cls)
-
-        return cls._singleton
-
     def register(self, position: tuple[int, int], watcher: TileSubsciber) -> None:
         self.watchers.setdefault(position, []).append(watcher)
 
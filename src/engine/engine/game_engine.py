@@ -12,9 +12,12 @@ from engine.interface.io.exceptions import PlayerException
 from engine.interface.io.game_result import (
     GameBanResult,
     GameCancelledResult,
+    GameResult,
     GameSuccessResult,
 )
 from engine.interface.io.input_validator import MoveValidator
+from engine.interface.io.local_connection import Agent
+from engine.interface.io.player_connection import PlayerConnection
 from engine.interface.logging.event_factory import event_banned_factory
 from engine.interface.logging.event_inspector import EventInspector
 from engine.state.game_state import GameState
@@ -25,9 +28,10 @@ from engine.state.player_state import PlayerState
 from engine.state.state_mutator import StateMutator
 
 from lib.config.expansion import EXPANSION
-from lib.config.map_config import MAP_CENTER, TILE_EDGE_IDS, TILE_EXTERNAL_POS
+from lib.config.map_config import MAP_CENTER, MONASTARY_IDENTIFIER
+from lib.interact.edge import EDGE_OFFSETS, EDGES
 from lib.interact.structure import StructureType
-from lib.interact.tile import MONASTARY_IDENTIFIER, Tile
+from lib.interact.tile import Tile
 from lib.interface.events.event_game_ended import (
     EventGameEndedStaleMate,
 )
@@ -37,36 +41,61 @@ from lib.interface.events.event_player_meeple_freed import EventPlayerMeepleFree
 from lib.interface.events.event_river_phase_completed import EventRiverPhaseCompleted
 from lib.interface.events.event_tile_placed import EventStartingTilePlaced
 
-from random import sample
+from random import Random, getrandbits
+from typing import Sequence
+import json
 import shutil
 
 
 class GameEngine:
-    def __init__(self, print_recording_interactive: bool = False) -> None:
-        print("Intialising game engine!")
+    def __init__(
+        self,
+        print_recording_interactive: bool = False,
+        agents: Sequence[Agent] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Passing agents runs the game headless, each agent is called in process
+        with the query for its player id and no files are read or written
+
+        Every random draw of the match comes from one generator, the seed is
+        recorded with the game so it can be played again tile for tile
+        """
+        if agents is None:
+            print("Intialising game engine!")
+        else:
+            assert len(agents) == NUM_PLAYERS
 
-        self.state = GameState()
+        self.agents = agents
+        self.seed = getrandbits(32) if seed is None else seed
+        self.rng = Random(self.seed)
+        self.state = GameState(
+            [{"team_id": i} for i in range(NUM_PLAYERS)] if agents is not None else None
+        )
         self.validator = MoveValidator(self.state)
         self.mutator = StateMutator(self.state)
         self.censor = CensorEvent(self.state)
 
-    def start(self) -> None:
+    def start(self) -> GameResult:
         try:
-            self.state._connect_players()
+            self.state._connect_players(self.agents)
             self.run_game()
         except PlayerException as e:
             event = event_banned_factory(e)
             self.mutator.commit(event)
         finally:
-            self.finish()
+            result = self.finish()
+
+        return result
 
     def run_game(self) -> None:
         assert NUM_PLAYERS == len(self.state.players)
-        turn_order = sample(list(self.state.players.keys()), k=NUM_PLAYERS)
+        turn_order = self.rng.sample(list(self.state.players.keys()), k=NUM_PLAYERS)
         self.state.turn_order = turn_order
 
         while not self.state.is_game_over():
-            print(f"New round {self.state.round + 1}", flush=True)
+            if self.agents is None:
+                print(f"New round {self.state.round + 1}", flush=True)
 
             if self.state.round == -1:
                 self.mutator.commit(
@@ -76,6 +105,7 @@ class GameEngine:
                             player._to_player_model()
                             for player in self.state.players.values()
                         ],
+                        seed=self.seed,
                     )
                 )
 
@@ -83,7 +113,7 @@ class GameEngine:
                 self.state.map.place_river_start(MAP_CENTER)
                 self.mutator.commit(
                     EventStartingTilePlaced(
-                        tile_placed=Tile.get_starting_tile()._to_model()
+                        tile_placed=self.state.map.placed_tiles[-1]._to_model()
                     )
                 )
 
@@ -111,14 +141,7 @@ class GameEngine:
                         self.start_player_turn(player)
                         continue
 
-                tiles_drawn = sample(
-                    list(self.state.map.available_tiles), NUM_TILES_DRAWN_PER_ROUND
-                )
-
-                for tile in tiles_drawn:
-                    self.state.map.available_tiles.remove(tile)
-                    self.state.map.available_tiles_by_type[tile.tile_type].remove(tile)
-
+                tiles_drawn = self.draw_tiles(NUM_TILES_DRAWN_PER_ROUND)
                 player.tiles.extend(tiles_drawn)
                 self.mutator.commit(
                     EventPlayerDrewTiles(
@@ -154,6 +177,9 @@ class GameEngine:
                 self.state.finalise_game()
                 self.calc_final_points()
 
+    def draw_tiles(self, count: int) -> list[Tile]:
+        return self.state.map.available_tiles.draw(self.rng, count)
+
     def start_player_turn(self, player: PlayerState) -> None:
         response = player.connection.query_place_tile(
             self.state, self.validator, self.censor
@@ -169,31 +195,29 @@ class GameEngine:
         self.state.start_base_phase()
         tile = self.state.map.placed_tiles[-1]
 
-        edge: str
-        for e, s in tile.internal_edges.items():
-            assert tile.placed_pos is not None
+        assert tile.placed_pos is not None
+        x, y = tile.placed_pos
+
+        # The river end continues the open river edge of the last river tile
+        for edge in EDGES:
+            if tile.internal_edges.by_id[edge] != StructureType.RIVER:
+                continue
 
-            if s == StructureType.RIVER and not Tile.get_external_tile(
-                e, tile.placed_pos, self.state.map._grid
-            ):
-                edge = e
+            dx, dy = EDGE_OFFSETS[edge]
+            if self.state.map._grid.is_empty(x + dx, y + dy):
                 break
 
         else:
             assert False
 
-        assert tile.placed_pos is not None
-        x, y = tile.placed_pos
-
         river_end = Tile.get_river_end_tile()
-        river_end.rotate_clockwise(TILE_EDGE_IDS[edge])
-        x1, y1 = TILE_EXTERNAL_POS[edge](x, y)
-        river_end.placed_pos = x1, y1
+        river_end.rotate_clockwise(edge)
+        x1, y1 = x + dx, y + dy
 
-        self.state.map._grid[y1][x1] = river_end
-        self.state.map.placed_tiles.append(river_end)
+        self.state.map.place_tile(river_end, (x1, y1))
 
-        print("River End Tile")
+        if self.agents is None:
+            print("River End Tile")
         self.mutator.commit(EventRiverPhaseCompleted(end_tile=river_end._to_model()))
 
         if EXPANSION:
@@ -201,14 +225,7 @@ class GameEngine:
 
         # Replinishes cards if moving to base phase or new game (river phase) this is before player draws tile for the round
         for player in self.state.players.values():
-            tiles_drawn = sample(
-                list(self.state.map.available_tiles), NUM_TILES_IN_HAND
-            )
-            self.state.map.available_tiles.difference_update(tiles_drawn)
-
-            for tile in tiles_drawn:
-                self.state.map.available_tiles_by_type[tile.tile_type].remove(tile)
-
+            tiles_drawn = self.draw_tiles(NUM_TILES_IN_HAND)
             player.tiles.extend(tiles_drawn)
 
             self.mutator.commit(
@@ -251,7 +268,7 @@ class GameEngine:
 
                 reward = len(subsribers[0].filled)
                 self.state.players[meeple.player_id].points += reward
-                meeple._free_meeple()
+                self.state._free_meeple(meeple)
                 self.mutator.commit(
                     EventPlayerMeepleFreed(
                         player_id=meeple.player_id,
@@ -303,7 +320,7 @@ class GameEngine:
 
             for meeple in partial_rewarded_meeples:
                 self.state.players[meeple.player_id].points += reward
-                meeple._free_meeple()
+                self.state._free_meeple(meeple)
                 self.mutator.commit(
                     EventPlayerMeepleFreed(
                         player_id=meeple.player_id,
@@ -314,7 +331,7 @@ class GameEngine:
                 )
 
             for meeple in returning_meeples:
-                meeple._free_meeple()
+                self.state._free_meeple(meeple)
                 self.mutator.commit(
                     EventPlayerMeepleFreed(
                         player_id=meeple.player_id,
@@ -327,7 +344,7 @@ class GameEngine:
         player, points = self.state.get_player_points()[0]
         self.mutator.commit(EventPlayerWon(player_id=player, points=points))
 
-    def finish(self) -> None:
+    def finish(self) -> GameResult:
         # Write the result.
         inspector = EventInspector(
             self.state.event_history,
@@ -335,10 +352,30 @@ class GameEngine:
             self.state.get_rankings(),
         )
         result = inspector.get_result()
+        result.seed = self.seed
+
+        # Headless games only report the result to the caller
+        if self.agents is not None:
+            return result
+
+        for player_state in self.state.players.values():
+            if isinstance(player_state.connection, PlayerConnection):
+                player_state.connection.close()
 
         with open(f"{CORE_DIRECTORY}/output/results.json", "w") as f:
             f.write(result.model_dump_json())
 
+        # Write the latency of each step of each query, per player and query type
+        with open(f"{CORE_DIRECTORY}/output/latency.json", "w") as f:
+            json.dump(
+                {
+                    player.id: player.connection.get_latency_report()
+                    for player in self.state.players.values()
+                    if isinstance(player.connection, PlayerConnection)
+                },
+                f,
+            )
+
         # Write the game log.
         with open(f"{CORE_DIRECTORY}/output/game.json", "w") as f:
             f.write(inspector.get_recording_json())
@@ -384,3 +421,5 @@ class GameEngine:
 
             case GameCancelledResult():
                 pass
+
+        return result
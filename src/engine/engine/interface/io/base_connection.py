@@ -0,0 +1,58 @@
+from engine.interface.io.input_validator import MoveValidator
+from engine.interface.io.censor_event import CensorEvent, CensoredEvent
+
+from lib.interface.events.typing import EventType
+from lib.interface.events.moves.move_place_tile import MovePlaceTile
+from lib.interface.events.moves.move_place_meeple import (
+    MovePlaceMeeple,
+    MovePlaceMeeplePass,
+)
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine.state.game_state import GameState
+
+
+class BaseConnection(ABC):
+    """
+    BaseConnection
+    _Engine side of a player, queries are answered with validated moves_
+    """
+
+    def __init__(self, player_id: int) -> None:
+        self.player_id: int = player_id
+        self._record_update_watermark: int = 0
+
+    def _get_record_update(
+        self, state: "GameState", censor: CensorEvent
+    ) -> dict[int, CensoredEvent]:
+        if self._record_update_watermark >= len(state.event_history):
+            raise RuntimeError(
+                "Record update watermark out of sync with state, did you try to send two queries without committing the first?"
+            )
+        log = censor.get_log(self.player_id)
+        result = {i: log[i] for i in range(self._record_update_watermark, len(log))}
+        self._record_update_watermark = len(log)
+        return result
+
+    def _get_record_update_dict(
+        self, state: "GameState", censor: CensorEvent
+    ) -> dict[int, EventType]:
+        return {
+            i: censored.event
+            for i, censored in self._get_record_update(state, censor).items()
+        }
+
+    @abstractmethod
+    def query_place_tile(
+        self, state: "GameState", validator: MoveValidator, censor: CensorEvent
+    ) -> MovePlaceTile:
+        pass
+
+    @abstractmethod
+    def query_place_meeple(
+        self, state: "GameState", validator: MoveValidator, censor: CensorEvent
+    ) -> MovePlaceMeeple | MovePlaceMeeplePass:
+        pass
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Mapping, final
 
 from engine.config.game_config import NUM_MEEPLES
 
@@ -14,32 +14,99 @@ if TYPE_CHECKING:
     from engine.state.game_state import GameState
 
 
+@final
+class CensoredEvent:
+    """
+    CensoredEvent
+    _View of an event for one audience, shared by every player in that audience_
+
+    The json is serialised on first use and kept, so a view sent to several players
+    is only serialised once.
+    """
+
+    __slots__ = ("event", "_json")
+
+    def __init__(self, event: EventType) -> None:
+        self.event = event
+        self._json: str | None = None
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = self.event.model_dump_json()
+
+        return self._json
+
+
+def frame_query(query_type: str, update: Mapping[int, CensoredEvent]) -> str:
+    """
+    Frame Query
+    _Query json built from the cached json of its events_
+
+    Byte for byte what model_dump_json of the query model gives, without validating
+    or serialising the update again.
+    """
+    events = ",".join(f'"{i}":{censored.json}' for i, censored in update.items())
+    return f'{{"query_type":"{query_type}","update":{{{events}}}}}'
+
+
 class CensorEvent:
+    """
+    CensorEvent
+    _Keeps an outbound log of censored events per player, in step with the state_
+
+    Each committed event is censored once per audience, its owner and everyone else,
+    with the game start censored per player. Logs are index aligned with the event
+    history.
+    """
+
     def __init__(self, state: "GameState") -> None:
         self.state = state
+        self.logs: dict[int, list[CensoredEvent]] = {
+            player_id: [] for player_id in state.players
+        }
+        self._synced = 0
 
-    def censor(self, event: EventType, player_id: int) -> EventType:
-        match event:
-            case MovePlaceTile() as e:
-                if e.player_id == player_id:
-                    return e
+    def sync(self) -> None:
+        """
+        Censors the events committed since the last sync into every player's log
+        """
+        history = self.state.event_history
 
-                return e.get_public()
+        while self._synced < len(history):
+            self._append(history[self._synced])
+            self._synced += 1
 
-            case EventPlayerDrewTiles() as e:
-                if e.player_id == player_id:
-                    return e
+    def get_log(self, player_id: int) -> list[CensoredEvent]:
+        self.sync()
+        return self.logs[player_id]
 
-                return e.get_public()
+    def _append(self, event: EventType) -> None:
+        match event:
+            case MovePlaceTile() | EventPlayerDrewTiles() as e:
+                own = CensoredEvent(e)
+                public = CensoredEvent(e.get_public())
+
+                for player_id, log in self.logs.items():
+                    log.append(own if player_id == e.player_id else public)
 
             case EventGameStarted() as e:
-                return PublicEventGameStarted(
-                    turn_order=e.turn_order,
-                    players=[player.get_public() for player in e.players],
-                    num_starting_meeples=NUM_MEEPLES,
-                    you=filter(
-                        lambda x: x.player_id == player_id, e.players
-                    ).__next__(),
-                )
-
-        return event
+                players = [player.get_public() for player in e.players]
+
+                for you in e.players:
+                    self.logs[you.player_id].append(
+                        CensoredEvent(
+                            PublicEventGameStarted(
+                                turn_order=e.turn_order,
+                                players=players,
+                                num_starting_meeples=NUM_MEEPLES,
+                                you=you,
+                            )
+                        )
+                    )
+
+            case _:
+                shared = CensoredEvent(event)
+
+                for log in self.logs.values():
+                    log.append(shared)
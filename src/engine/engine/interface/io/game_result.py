@@ -1,4 +1,4 @@
-from typing import Literal, Mapping, Sequence
+from typing import Literal, Mapping, Sequence, TypeAlias, Union
 from pydantic import BaseModel
 
 from lib.interface.io.ban_type import BanType
@@ -9,19 +9,28 @@ class GameBanResult(BaseModel):
     ban_type: BanType
     player: int
     reason: str
+    seed: int | None = None
 
 
 class GameSuccessResult(BaseModel):
     result_type: Literal["SUCCESS"] = "SUCCESS"
     ranking: Sequence[int]
     score: Mapping[int, int]
+    seed: int | None = None
 
 
 class GameCancelledResult(BaseModel):
     result_type: Literal["CANCELLED"] = "CANCELLED"
     reason: str
+    seed: int | None = None
 
 
 class GameCrashedResult(BaseModel):
     result_type: Literal["CRASHED"] = "CRASHED"
     reason: str
+    seed: int | None = None
+
+
+GameResult: TypeAlias = Union[
+    GameBanResult, GameSuccessResult, GameCancelledResult, GameCrashedResult
+]
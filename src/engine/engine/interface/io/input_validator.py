@@ -1,8 +1,7 @@
-from copy import deepcopy
 from typing import TYPE_CHECKING
 
 # from helper.utils import print_map
-from lib.game.game_logic import TileModifier
+from lib.interact.tile import TileModifier
 from engine.config.game_config import MAX_NUM_TILES_IN_HAND
 from lib.config.map_config import MONASTARY_IDENTIFIER, NUM_PLACEABLE_TILE_TYPES
 from lib.interface.events.moves.move_place_meeple import (
@@ -13,6 +12,7 @@ from lib.interface.events.moves.move_place_tile import MovePlaceTile
 from lib.interface.events.moves.typing import MoveType
 from lib.interface.queries.base_query import BaseQuery
 from lib.interact.tile import Tile
+from lib.interact.edge import EDGE_IDS, EDGE_NAMES, EDGE_OPPOSITE
 from lib.interact.structure import StructureType
 
 import string
@@ -23,6 +23,9 @@ VALID_PLACEABLE_TILE_TYPES.extend(
 )
 
 VALID_ROTATIONS = [0, 1, 2, 3]
+
+# Edges are checked in the order tile edges are listed
+VALIDATION_EDGE_ORDER = [EDGE_IDS[edge] for edge in Tile.get_edges()]
 VALID_MEEPLE_PLACEMENTS = Tile.get_starting_tile().internal_claims.keys()
 VALID_STRUCTURE_CLAIMS = [
     StructureType.MONASTARY,
@@ -68,8 +71,8 @@ class MoveValidator:
         # print_map(self.state.map._grid, range(75, 96))
 
         neighbouring_tiles = {
-            edge: Tile.get_external_tile(edge, (x, y), self.state.map._grid)
-            for edge in Tile.get_edges()
+            edge: Tile.get_neighbour(edge, (x, y), self.state.map._grid)
+            for edge in VALIDATION_EDGE_ORDER
         }
 
         # Validate Tile Type
@@ -96,7 +99,7 @@ class MoveValidator:
                 f"You tried placing a tile in your hand but the player tile index mismatched - Player tile index {e.player_tile_index}, Tile Type Given {tile.tile_type}"
             )
 
-        tile = deepcopy(tile)
+        tile = Tile.from_type(tile.type)
 
         # Validate rotation
         if e.tile.rotation not in VALID_ROTATIONS:
@@ -104,10 +107,15 @@ class MoveValidator:
                 f"You tried placing with an invalid rotation - Recieved Tile Rotation {e.tile.rotation}"
             )
 
-        while tile.rotation != e.tile.rotation:
-            tile.rotate_clockwise(1)
+        tile.rotate_to(e.tile.rotation)
         # Validate Tile Pos
-        if not any(neighbouring_tiles.values()):
+        if (x, y) not in self.state.map.frontier:
+            occupant = self.state.map._grid.get(x, y)
+            if occupant is not None:
+                raise ValueError(
+                    f"You placed a tile on an occupied space - {occupant} at {x, y}"
+                )
+
             raise ValueError(
                 f"You placed a tile in an empty space - no neighbours at {x, y}"
             )
@@ -117,15 +125,15 @@ class MoveValidator:
         river_connections = 0
 
         for edge, neighbour_tile in neighbouring_tiles.items():
-            edge_structure = tile.internal_edges[edge]
+            edge_structure = tile.internal_edges.by_id[edge]
 
             # Flag if there is an edge with a river on this tile.
-            river_flag = edge_structure == StructureType.RIVER
+            river_flag = river_flag or edge_structure == StructureType.RIVER
 
             if neighbour_tile:
                 # Check if edges are aligned with correct structures
-                neighbouring_structure = neighbour_tile.internal_edges[
-                    Tile.get_opposite(edge)
+                neighbouring_structure = neighbour_tile.internal_edges.by_id[
+                    EDGE_OPPOSITE[edge]
                 ]
                 if not StructureType.is_compatible(
                     edge_structure, neighbouring_structure
@@ -133,7 +141,7 @@ class MoveValidator:
                     # print(tile.tile_type, tile.rotation)
                     # print(neighbour_tile.tile_type, neighbour_tile.rotation)
                     raise ValueError(
-                        f"You placed a tile in an mismatched position - {edge} mismatch, your edge is {edge_structure} on rotation {tile.rotation} at coordinates {e.tile.pos} != {neighbouring_structure} on rotation {neighbour_tile.rotation} at position {neighbour_tile.placed_pos}"
+                        f"You placed a tile in an mismatched position - {EDGE_NAMES[edge]} mismatch, your edge is {edge_structure} on rotation {tile.rotation} at coordinates {e.tile.pos} != {neighbouring_structure} on rotation {neighbour_tile.rotation} at position {neighbour_tile.placed_pos}"
                     )
 
                 # Check if we successfully connected a river structure
@@ -144,48 +152,13 @@ class MoveValidator:
             # Handling the case where the edge does not have a tile next to it
             # U - Turn handling
             elif edge_structure == StructureType.RIVER:
-                # Handling direct u-turns: propagate one out from the proposed disconnected river edge, and check surroundings
-
-                forcast_coordinates_one = {
-                    "top_edge": (0, -1),
-                    "right_edge": (1, 0),
-                    "bottom_edge": (0, 1),
-                    "left_edge": (-1, 0),
-                }
-
-                extension = forcast_coordinates_one[edge]
-                forecast_x = x + extension[0]
-                forecast_y = y + extension[1]
-
-                for coords in forcast_coordinates_one.values():
-                    checking_x = forecast_x + coords[0]
-                    checking_y = forecast_y + coords[1]
-                    if not (checking_x == x and checking_y == y):
-                        if self.state.map._grid[checking_y][checking_x] is not None:
-                            raise ValueError(
-                                "You placed a tile that will lead to a U-Turn in the river."
-                            )
-
-                # Handling problematic u-turn: if there is two tile away from a disconnected river edge, it means a u-turn has occurred
-                forcast_coordinates_two = {
-                    "top_edge": (0, -2),
-                    "right_edge": (2, 0),
-                    "bottom_edge": (0, 2),
-                    "left_edge": (-2, 0),
-                }
-                extension = forcast_coordinates_two[edge]
-
-                # Look at the tile two tiles away from the direction the river is facing on our current tile
-                forecast_x = x + extension[0]
-                forecast_y = y + extension[1]
-                for coords in forcast_coordinates_one.values():
-                    checking_x = forecast_x + coords[0]
-                    checking_y = forecast_y + coords[1]
-
-                    if self.state.map._grid[checking_y][checking_x] is not None:
-                        raise ValueError(
-                            "You placed a tile that will lead to a U-Turn in the river."
-                        )
+                # Handling direct and problematic u-turns: the cells one and two
+                # out from the disconnected river edge must have no other neighbours
+                if self.state._leads_to_u_turn((x, y), edge):
+                    raise ValueError(
+                        "You placed a tile that will lead to a U-Turn in the river."
+                    )
+
         # Check if there is at least one river edge that is connected
         if river_flag and river_connections == 0:
             raise ValueError(
@@ -0,0 +1,78 @@
+from engine.interface.io.base_connection import BaseConnection
+from engine.interface.io.censor_event import CensorEvent
+from engine.interface.io.exceptions import (
+    InvalidMessageException,
+    InvalidMoveException,
+)
+from engine.interface.io.input_validator import MoveValidator
+
+from lib.interface.events.moves.typing import MoveType
+from lib.interface.events.moves.move_place_tile import MovePlaceTile
+from lib.interface.events.moves.move_place_meeple import (
+    MovePlaceMeeple,
+    MovePlaceMeeplePass,
+)
+from lib.interface.queries.query_place_meeple import QueryPlaceMeeple
+from lib.interface.queries.query_place_tile import QueryPlaceTile
+from lib.interface.queries.typing import QueryType
+
+from typing import TYPE_CHECKING, Callable, TypeAlias, final
+
+if TYPE_CHECKING:
+    from engine.state.game_state import GameState
+
+
+Agent: TypeAlias = Callable[[QueryType], MoveType]
+
+
+@final
+class LocalPlayerConnection(BaseConnection):
+    """
+    LocalPlayerConnection
+    _Headless connection to an in-process agent, no pipes, serialisation or timeouts_
+
+    Queries share event objects with the engine state, agents must treat them as read only.
+    """
+
+    def __init__(self, player_id: int, agent: Agent) -> None:
+        super().__init__(player_id)
+        self.agent = agent
+
+    def _query_move(
+        self,
+        query: QueryType,
+        response_types: tuple[type[MoveType], ...],
+        validator: MoveValidator,
+    ) -> MoveType:
+        move = self.agent(query)
+
+        if not isinstance(move, response_types):
+            raise InvalidMessageException(
+                self.player_id,
+                f"You responded to {query.query_type} with an unexpected move - {type(move).__name__}",
+            )
+
+        try:
+            validator.validate(move, query, self.player_id)
+        except ValueError as e:
+            raise InvalidMoveException(self.player_id, str(e), move)
+
+        return move
+
+    def query_place_tile(
+        self, state: "GameState", validator: MoveValidator, censor: CensorEvent
+    ) -> MovePlaceTile:
+        query = QueryPlaceTile(update=self._get_record_update_dict(state, censor))
+        move = self._query_move(query, (MovePlaceTile,), validator)
+        assert isinstance(move, MovePlaceTile)
+        return move
+
+    def query_place_meeple(
+        self, state: "GameState", validator: MoveValidator, censor: CensorEvent
+    ) -> MovePlaceMeeple | MovePlaceMeeplePass:
+        query = QueryPlaceMeeple(update=self._get_record_update_dict(state, censor))
+        move = self._query_move(
+            query, (MovePlaceMeeple, MovePlaceMeeplePass), validator
+        )
+        assert isinstance(move, (MovePlaceMeeple, MovePlaceMeeplePass))
+        return move
@@ -0,0 +1,146 @@
+from engine.config.io_config import OPEN_PIPE_POLL_MS
+from engine.interface.io.exceptions import TimeoutException
+
+import errno
+import os
+import select
+import selectors
+from time import monotonic_ns, sleep
+from typing import TYPE_CHECKING, final
+
+if TYPE_CHECKING:
+    from engine.interface.io.player_connection import PlayerConnection
+
+
+# Bytes read per drain of a bot that writes while it is not being queried
+DRAIN_CHUNK_SIZE = 4096
+
+NS_PER_MS = 1_000_000
+
+
+@final
+class PipeSelector:
+    """
+    PipeSelector
+    _Owns the pipes of every player connection and waits on all of them at once_
+
+    Output a bot writes while another is being queried is read and discarded, so an
+    idle bot can neither fill its pipe nor have stale output read as its next move.
+
+    Deadlines are monotonic_ns timestamps and waits are poll timeouts, no signals are
+    used so engines can run on several threads of one process.
+    """
+
+    def __init__(self) -> None:
+        self._selector = selectors.DefaultSelector()
+        self._connections: list["PlayerConnection"] = []
+
+        # Pipes the bot closed, reads on them return end of file straight away
+        self._closed: set[int] = set()
+
+    def add(self, connection: "PlayerConnection") -> None:
+        self._connections.append(connection)
+
+    def open_pipes(self, timeout_ms: int, error_message: str) -> None:
+        """
+        Opens the pipes of every connection at once
+
+        A connection is open once its bot has opened to_engine.pipe for writing and
+        from_engine.pipe for reading. Our ends of to_engine.pipe are opened without
+        blocking, from_engine.pipe can only be opened for writing once the bot reads
+        it so it is polled until then.
+        """
+        start = monotonic_ns()
+        deadline = start + timeout_ms * NS_PER_MS
+
+        pending = {
+            connection: os.open(connection.to_engine_path, os.O_RDONLY | os.O_NONBLOCK)
+            for connection in self._connections
+        }
+
+        while pending:
+            for connection in list(pending):
+                try:
+                    fd = os.open(
+                        connection.from_engine_path, os.O_WRONLY | os.O_NONBLOCK
+                    )
+                except OSError as e:
+                    if e.errno != errno.ENXIO:
+                        raise
+
+                    continue
+
+                # Writes stay non blocking so they can time out, see write
+                to_engine_fd = pending.pop(connection)
+                os.set_blocking(to_engine_fd, True)
+
+                self._selector.register(to_engine_fd, selectors.EVENT_READ)
+                connection._attach_pipes(to_engine_fd, fd, monotonic_ns() - start)
+
+            if not pending:
+                break
+
+            if monotonic_ns() >= deadline:
+                raise TimeoutException(
+                    min(connection.player_id for connection in pending),
+                    error_message,
+                    None,
+                )
+
+            sleep(OPEN_PIPE_POLL_MS / 1000)
+
+    def wait_readable(self, fd: int, deadline: int | None = None) -> bool:
+        """
+        Blocks until the pipe has data or is closed, False if the deadline passed
+        first. Other pipes are drained meanwhile
+        """
+        while fd not in self._closed:
+            timeout = None
+            if deadline is not None:
+                remaining = deadline - monotonic_ns()
+                if remaining <= 0:
+                    return False
+
+                timeout = remaining / 1e9
+
+            for key, _ in self._selector.select(timeout):
+                if key.fd == fd:
+                    return True
+
+                self._drain(key.fd)
+
+        return True
+
+    def write(self, fd: int, data: bytes, deadline: int | None = None) -> bool:
+        """
+        Writes all of data to a non blocking pipe, False if the deadline passed
+        before the bot read enough of it
+        """
+        view = memoryview(data)
+        poller = select.poll()
+        poller.register(fd, select.POLLOUT)
+
+        while True:
+            try:
+                view = view[os.write(fd, view) :]
+            except BlockingIOError:
+                pass
+
+            if not view:
+                return True
+
+            timeout_ms = None
+            if deadline is not None:
+                remaining = deadline - monotonic_ns()
+                if remaining <= 0:
+                    return False
+
+                # Rounded up so the poll does not spin on the last millisecond
+                timeout_ms = -(-remaining // NS_PER_MS)
+
+            poller.poll(timeout_ms)
+
+    def _drain(self, fd: int) -> None:
+        if not os.read(fd, DRAIN_CHUNK_SIZE):
+            self._selector.unregister(fd)
+            self._closed.add(fd)
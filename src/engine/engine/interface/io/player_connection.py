@@ -3,12 +3,12 @@
 from pydantic import TypeAdapter, ValidationError
 from engine.config.io_config import (
     CORE_DIRECTORY,
-    CUMULATIVE_TIMEOUT_SECONDS,
-    OPEN_PIPE_TIMEOUT_SECONDS,
+    CUMULATIVE_TIMEOUT_MS,
+    FROM_ENGINE_RING_CAPACITY,
     PIPE_LEN_DELIM,
     MAX_CHARACTERS_READ,
-    READ_CHUNK_SIZE,
-    TIMEOUT_SECONDS,
+    SHARED_MEMORY_TRANSPORT,
+    TIMEOUT_MS,
 )
 
 
@@ -20,10 +20,21 @@ from engine.interface.io.exceptions import (
     TimeoutException,
 )
 
+from engine.interface.io.base_connection import BaseConnection
 from engine.interface.io.input_validator import MoveValidator
-from engine.interface.io.censor_event import CensorEvent
-
-from lib.interface.events.typing import EventType
+from engine.interface.io.censor_event import CensorEvent, frame_query
+from engine.interface.io.pipe_selector import NS_PER_MS, PipeSelector
+from engine.interface.logging.latency_histogram import LatencyHistogram
+
+from lib.interface.io.pipe_reader import MalformedSizeError, PipeReader
+from lib.interface.io.shared_ring import (
+    DOORBELL,
+    RING_NAMES_FILE,
+    SIZE,
+    RingFullError,
+    SharedRing,
+    SharedRingReader,
+)
 from lib.interface.queries.query_place_meeple import QueryPlaceMeeple
 from lib.interface.queries.query_place_tile import QueryPlaceTile
 from lib.interface.queries.typing import QueryType
@@ -35,17 +46,13 @@ from lib.interface.events.moves.move_place_meeple import (
     MovePlaceMeeplePass,
 )
 
-from io import TextIOWrapper
 import json
-from math import log10, floor
-from signal import SIGALRM, alarm, signal
-from time import time
-from itertools import islice
+import os
+from time import monotonic_ns
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
-    NoReturn,
     Optional,
     ParamSpec,
     Type,
@@ -57,6 +64,9 @@ from typing import (
 # performance boost on deserializing unions.
 cached_type_adapters: dict[frozenset[str], TypeAdapter[Any]] = {}
 
+# Steps of a query timed separately, see PlayerConnection._exchange
+LATENCY_STEPS = ("send", "think", "receive", "validate")
+
 if TYPE_CHECKING:
     from engine.state.game_state import GameState
 
@@ -85,6 +95,10 @@ def handle_sigpipe(fn: Callable[P, T1]) -> Callable[P, T1]:
             raise BrokenPipeException(
                 self.player_id, "You closed 'from_engine.pipe'.", query
             )
+        except EOFError:
+            raise BrokenPipeException(
+                self.player_id, "You closed 'to_engine.pipe'.", query
+            )
 
         return result
 
@@ -112,9 +126,12 @@ def handle_invalid(fn: Callable[P, T1]) -> Callable[P, T1]:
 
 
 def time_limited(
-    error_message: str = "You took too long to respond.", initial: bool = False
+    error_message: str = "You took too long to respond.",
 ) -> Callable[[Callable[P, T1]], Callable[P, T1]]:
-    """Decorator to trigger ban if the player takes too long to respond."""
+    """Decorator to trigger ban if the player takes too long to respond.
+
+    Pipe waits of the call are bounded by a monotonic deadline, see PlayerConnection._wait.
+    """
 
     def dfn1(fn: Callable[P, T1]) -> Callable[P, T1]:
         def dfn2(*args: P.args, **kwargs: P.kwargs) -> T1:
@@ -123,21 +140,18 @@ def time_limited(
             if len(args) >= 2 and isinstance(args[1], BaseQuery):
                 query = args[1]  # type: ignore
 
-            def on_timeout_alarm(*_) -> NoReturn:  # type: ignore
-                raise TimeoutException(self.player_id, error_message, query)
-
-            signal(SIGALRM, on_timeout_alarm)
-
-            alarm(OPEN_PIPE_TIMEOUT_SECONDS if initial else TIMEOUT_SECONDS)
-            start = time()
+            start = monotonic_ns()
+            self._deadline = start + TIMEOUT_MS * NS_PER_MS
 
-            result = fn(*args, **kwargs)
-
-            end = time()
-            alarm(0)
+            try:
+                result = fn(*args, **kwargs)
+            except TimeoutError:
+                raise TimeoutException(self.player_id, error_message, query)
+            finally:
+                self._deadline = None
 
-            self._cumulative_time += end - start
-            if self._cumulative_time > CUMULATIVE_TIMEOUT_SECONDS:
+            self._cumulative_time += monotonic_ns() - start
+            if self._cumulative_time > CUMULATIVE_TIMEOUT_MS * NS_PER_MS:
                 raise CumulativeTimeoutException(self.player_id, error_message, query)
 
             return result
@@ -152,85 +166,160 @@ T3 = TypeVar("T3", bound=MoveType)
 
 
 @final
-class PlayerConnection:
-    def __init__(self, player_id: int) -> None:
-        self.player_id: int = player_id
-        self._to_engine_pipe: TextIOWrapper
-        self._from_engine_pipe: TextIOWrapper
-        self._cumulative_time: float = 0
-        self._record_update_watermark: int = 0
-
-        self._open_pipes()
-
-    @time_limited(
-        "You didn't open 'to_engine' for writing or 'from_engine.pipe' for reading in time.",
-        initial=True,
-    )
-    def _open_pipes(self) -> None:
-        self._to_engine_pipe = open(
-            f"{CORE_DIRECTORY}/submission{self.player_id}/io/to_engine.pipe", "r"
+class PlayerConnection(BaseConnection):
+    """
+    PlayerConnection
+    _Connection to a bot over its pipes, opened by the selector it is added to_
+
+    With the shared memory transport, messages are passed through a ring per pipe
+    and the pipes only carry a doorbell byte per message, so waits and deadlines
+    work the same on both transports.
+    """
+
+    def __init__(self, player_id: int, selector: PipeSelector) -> None:
+        super().__init__(player_id)
+        self._selector = selector
+        self._to_engine_pipe: PipeReader | SharedRingReader
+        self._from_engine_pipe: int
+        self._rings: tuple[SharedRing, SharedRing] | None = None
+
+        # Monotonic nanoseconds, the deadline is only set while a query is timed
+        self._cumulative_time: int = 0
+        self._deadline: int | None = None
+
+        # Latency of each step of a query by query type, and when the bot's move
+        # first became readable during the current query
+        self.latency: dict[str, dict[str, LatencyHistogram]] = {}
+        self._frame_time = 0
+        self._ready_at: int | None = None
+
+        self.to_engine_path = (
+            f"{CORE_DIRECTORY}/submission{self.player_id}/io/to_engine.pipe"
         )
-        self._from_engine_pipe = open(
-            f"{CORE_DIRECTORY}/submission{self.player_id}/io/from_engine.pipe", "w"
+        self.from_engine_path = (
+            f"{CORE_DIRECTORY}/submission{self.player_id}/io/from_engine.pipe"
         )
+        self.ring_names_path = (
+            f"{CORE_DIRECTORY}/submission{self.player_id}/io/{RING_NAMES_FILE}"
+        )
+
+        if SHARED_MEMORY_TRANSPORT:
+            self._create_rings()
+
+        # The bot uses rings whenever their names are there, names left by an
+        # earlier game would point it at rings that no longer exist
+        elif os.path.exists(self.ring_names_path):
+            os.remove(self.ring_names_path)
+
+        selector.add(self)
+
+    def _create_rings(self) -> None:
+        """
+        Creates the rings of both pipes, their names are written next to the pipes
+        before these are opened so the bot finds them once its pipes open
+        """
+        to_engine = SharedRing.create(MAX_CHARACTERS_READ + SIZE.size)
+        from_engine = SharedRing.create(FROM_ENGINE_RING_CAPACITY)
+        self._rings = (to_engine, from_engine)
+
+        with open(self.ring_names_path, "w") as f:
+            json.dump({"to_engine": to_engine.name, "from_engine": from_engine.name}, f)
+
+    def _attach_pipes(
+        self, to_engine_fd: int, from_engine_fd: int, open_time: int
+    ) -> None:
+        if self._rings is None:
+            self._to_engine_pipe = PipeReader(
+                to_engine_fd,
+                MAX_CHARACTERS_READ,
+                PIPE_LEN_DELIM.encode(),
+                self._wait,
+            )
+        else:
+            self._to_engine_pipe = SharedRingReader(
+                to_engine_fd, self._rings[0], self._wait
+            )
+
+        self._from_engine_pipe = from_engine_fd
+        self._cumulative_time += open_time
+
+    def _wait(self, fd: int) -> None:
+        if not self._selector.wait_readable(fd, self._deadline):
+            raise TimeoutError()
+
+        if self._ready_at is None:
+            self._ready_at = monotonic_ns()
+
+    def close(self) -> None:
+        """
+        Frees the rings of the shared memory transport, the pipes close on exit
+        """
+        if self._rings is not None:
+            for ring in self._rings:
+                ring.close()
+
+            self._rings = None
+
+    def get_latency_report(self) -> dict[str, dict[str, dict[str, Any]]]:
+        return {
+            query_type: {step: histogram.to_dict() for step, histogram in steps.items()}
+            for query_type, steps in self.latency.items()
+        }
 
     def query_move(self) -> None:
         pass
 
     def _send(self, data: str) -> None:
-        self._from_engine_pipe.write(str(len(data)) + PIPE_LEN_DELIM)
-        self._from_engine_pipe.write(data)
-        self._from_engine_pipe.flush()
+        # Anything the bot wrote since its last move was not asked for
+        self._to_engine_pipe.discard()
 
-    def _receive(self) -> str:
-        # Read size of message.
-        buffer = bytearray()
-        while len(buffer) < floor(log10(MAX_CHARACTERS_READ)) + 1 and (
-            len(buffer) == 0 or buffer[-1] != ord(",")
-        ):
-            buffer.extend(self._to_engine_pipe.read(1).encode())
-
-        if buffer[-1] == ord(","):
-            size = int(buffer[0:-1].decode())
+        payload = data.encode()
+        if self._rings is None:
+            message = str(len(payload)).encode() + PIPE_LEN_DELIM.encode() + payload
         else:
-            raise InvalidMessageException(
-                player_id=self.player_id,
-                error_message="You send a message with a malformed message size.",
-            )
+            try:
+                self._rings[1].push(payload)
+            except RingFullError:
+                # The bot stopped reading, as it would with a full pipe
+                raise TimeoutError()
 
-        if size > MAX_CHARACTERS_READ:
-            raise InvalidMessageException(
-                player_id=self.player_id,
-                error_message=f"You send a message that was too long, {size} > {MAX_CHARACTERS_READ} maximum.",
-            )
+            message = DOORBELL
+
+        if not self._selector.write(self._from_engine_pipe, message, self._deadline):
+            raise TimeoutError()
 
-        # Read message.
-        buffer = bytearray()
-        while len(buffer) < size:
-            buffer.extend(
-                bytearray(
-                    self._to_engine_pipe.read(
-                        min((size - len(buffer)), READ_CHUNK_SIZE)
-                    ).encode()
+    def _receive(self) -> str:
+        try:
+            size = self._to_engine_pipe.read_size()
+
+            if size > MAX_CHARACTERS_READ:
+                raise InvalidMessageException(
+                    player_id=self.player_id,
+                    error_message=f"You send a message that was too long, {size} > {MAX_CHARACTERS_READ} maximum.",
                 )
-            )
 
-        return buffer.decode()
+            # The size of a shared memory message is checked again as it is read
+            return self._to_engine_pipe.read_payload(size)
+
+        except MalformedSizeError:
+            raise InvalidMessageException(
+                player_id=self.player_id,
+                error_message="You send a message with a malformed message size.",
+            )
 
     @handle_invalid
     @handle_sigpipe
     @time_limited()
     def _query_move(
-        self, query: QueryType, response_type: Type[T2], validator: MoveValidator
+        self,
+        query: QueryType,
+        payload: str,
+        response_type: Type[T2],
+        validator: MoveValidator,
     ) -> T2:
-        self._send(query.model_dump_json())
-
-        move = response_type.model_validate_json(self._receive())
-        try:
-            validator.validate(move, query, self.player_id)
-        except ValueError as e:
-            raise InvalidMoveError(str(e), move)
-        return move  # ignore: type
+        return self._exchange(
+            query, payload, response_type.model_validate_json, validator
+        )
 
     @handle_invalid
     @handle_sigpipe
@@ -238,12 +327,11 @@ class PlayerConnection:
     def _query_move_union(
         self,
         query: QueryType,
+        payload: str,
         response_type_1: Type[T2],
         response_type_2: Type[T3],
         validator: MoveValidator,
     ) -> Union[T2, T3]:
-        self._send(query.model_dump_json())
-
         types = frozenset([response_type_1.__name__, response_type_2.__name__])
         if types in cached_type_adapters:
             adapter = cached_type_adapters[types]
@@ -253,41 +341,85 @@ class PlayerConnection:
             )
             adapter = cached_type_adapters[types]
 
-        move = adapter.validate_json(self._receive())
+        return self._exchange(query, payload, adapter.validate_json, validator)
+
+    def _exchange(
+        self,
+        query: QueryType,
+        payload: str,
+        parse: Callable[[str], MoveType],
+        validator: MoveValidator,
+    ) -> MoveType:
+        """
+        Sends the query then reads, parses and validates the move, the latency of
+        each step is recorded once the move is valid
+        """
+        start = monotonic_ns()
+        self._send(payload)
+
+        sent = monotonic_ns()
+        self._ready_at = None
+
+        move = parse(self._receive())
+
+        received = monotonic_ns()
+        ready = sent if self._ready_at is None else self._ready_at
+
         try:
             validator.validate(move, query, self.player_id)
         except ValueError as e:
             raise InvalidMoveError(str(e), move)
-        return move  # type: ignore[no-any-return]
-
-    def _get_record_update_dict(
-        self, state: "GameState", censor: CensorEvent
-    ) -> dict[int, EventType]:
-        if self._record_update_watermark >= len(state.event_history):
-            raise RuntimeError(
-                "Record update watermark out of sync with state, did you try to send two queries without committing the first?"
-            )
-        result = dict(
-            [
-                (i, censor.censor(x, self.player_id))
-                for i, x in islice(
-                    enumerate(state.event_history), self._record_update_watermark, None
-                )
-            ]
+
+        validated = monotonic_ns()
+
+        self._record_latency(
+            query.query_type,
+            (
+                self._frame_time + sent - start,
+                ready - sent,
+                received - ready,
+                validated - received,
+            ),
         )
-        self._record_update_watermark = len(state.event_history)
-        return result
+        return move
+
+    def _record_latency(self, query_type: str, times: tuple[int, ...]) -> None:
+        steps = self.latency.get(query_type)
+        if steps is None:
+            steps = self.latency[query_type] = {
+                step: LatencyHistogram() for step in LATENCY_STEPS
+            }
+
+        for step, time in zip(LATENCY_STEPS, times):
+            steps[step].record(time // 1000)
 
     def query_place_tile(
         self, state: "GameState", validator: MoveValidator, censor: CensorEvent
     ) -> MovePlaceTile:
-        query = QueryPlaceTile(update=self._get_record_update_dict(state, censor))
-        return self._query_move(query, MovePlaceTile, validator)
+        start = monotonic_ns()
+        update = self._get_record_update(state, censor)
+
+        # Events were validated when created, the query only carries them
+        query = QueryPlaceTile.model_construct(
+            update={i: censored.event for i, censored in update.items()}
+        )
+        payload = frame_query(query.query_type, update)
+        self._frame_time = monotonic_ns() - start
+
+        return self._query_move(query, payload, MovePlaceTile, validator)
 
     def query_place_meeple(
         self, state: "GameState", validator: MoveValidator, censor: CensorEvent
     ) -> MovePlaceMeeple | MovePlaceMeeplePass:
-        query = QueryPlaceMeeple(update=self._get_record_update_dict(state, censor))
+        start = monotonic_ns()
+        update = self._get_record_update(state, censor)
+
+        query = QueryPlaceMeeple.model_construct(
+            update={i: censored.event for i, censored in update.items()}
+        )
+        payload = frame_query(query.query_type, update)
+        self._frame_time = monotonic_ns() - start
+
         return self._query_move_union(
-            query, MovePlaceMeeple, MovePlaceMeeplePass, validator
+            query, payload, MovePlaceMeeple, MovePlaceMeeplePass, validator
         )
@@ -1,8 +1,8 @@
-from typing import Union
 from engine.interface.io.game_result import (
     GameBanResult,
     GameCancelledResult,
     GameCrashedResult,
+    GameResult,
     GameSuccessResult,
 )
 from lib.interface.events.event_game_ended import (
@@ -32,11 +32,7 @@ class EventInspector:
         self.score = score
         self.ranking = ranking
 
-    def get_result(
-        self,
-    ) -> Union[
-        GameBanResult, GameSuccessResult, GameCancelledResult, GameCrashedResult
-    ]:
+    def get_result(self) -> GameResult:
         match self.history[-1]:
             case EventGameEndedCancelled() as e:
                 return GameCancelledResult(reason=e.reason)
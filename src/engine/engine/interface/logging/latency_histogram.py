@@ -0,0 +1,88 @@
+from typing import Any, final
+
+# Values below this are counted exactly, above it buckets keep this many steps
+# per power of two, so a bucket is within 1/64 of the values it counts
+SUB_BUCKET_COUNT = 128
+SUB_BUCKET_BITS = SUB_BUCKET_COUNT.bit_length() - 1
+HALF_SUB_BUCKET_COUNT = SUB_BUCKET_COUNT // 2
+
+REPORTED_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+@final
+class LatencyHistogram:
+    """
+    LatencyHistogram
+    _HDR style histogram of latencies in microseconds, log linear buckets_
+
+    Percentiles are reported as the highest value of their bucket.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @staticmethod
+    def get_bucket(value: int) -> int:
+        if value < SUB_BUCKET_COUNT:
+            return value
+
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return shift * HALF_SUB_BUCKET_COUNT + (value >> shift)
+
+    @staticmethod
+    def get_bucket_max(bucket: int) -> int:
+        if bucket < SUB_BUCKET_COUNT:
+            return bucket
+
+        shift, sub_bucket = divmod(bucket, HALF_SUB_BUCKET_COUNT)
+        shift -= 1
+        return ((sub_bucket + HALF_SUB_BUCKET_COUNT + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        value = max(value, 0)
+        bucket = LatencyHistogram.get_bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+
+        if not self.count or value < self.min:
+            self.min = value
+
+        self.max = max(self.max, value)
+        self.count += 1
+        self.total += value
+
+    def get_percentile(self, percentile: float) -> int:
+        if not self.count:
+            return 0
+
+        target = max(1, round(self.count * percentile / 100))
+        seen = 0
+
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(LatencyHistogram.get_bucket_max(bucket), self.max)
+
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "min_us": self.min,
+            "mean_us": self.total / self.count if self.count else 0,
+            "max_us": self.max,
+            "percentiles_us": {
+                str(percentile): self.get_percentile(percentile)
+                for percentile in REPORTED_PERCENTILES
+            },
+            # (highest value, count) of each non empty bucket, for merging matches
+            "buckets": [
+                (LatencyHistogram.get_bucket_max(bucket), self.counts[bucket])
+                for bucket in sorted(self.counts)
+            ],
+        }
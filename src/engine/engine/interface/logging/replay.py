@@ -0,0 +1,93 @@
+from engine.game_engine import GameEngine
+from engine.interface.io.game_result import GameResult
+from engine.interface.io.local_connection import Agent
+
+from lib.interface.events.event_game_started import EventGameStarted
+from lib.interface.events.event_player_bannned import EventPlayerBanned
+from lib.interface.events.moves.move_place_meeple import (
+    MovePlaceMeeple,
+    MovePlaceMeeplePass,
+)
+from lib.interface.events.moves.move_place_tile import MovePlaceTile
+from lib.interface.events.moves.typing import MoveType
+from lib.interface.events.typing import EventType
+from lib.interface.queries.typing import QueryType
+
+from collections import deque
+from pydantic import RootModel, TypeAdapter
+from typing import final
+
+RecordingAdapter = TypeAdapter(list[EventType])
+
+
+class ReplayExhaustedError(Exception):
+    def __init__(self, player_id: int) -> None:
+        super().__init__(f"The recording has no more moves for player {player_id}.")
+        self.player_id = player_id
+
+
+@final
+class Replay:
+    """
+    Replay
+    _Plays a recorded game again in process, without any bots_
+
+    The engine is seeded with the recorded seed so it draws the same tiles, and
+    every query is answered with the next recorded move of its player. Moves are
+    validated and committed as in the original game.
+    """
+
+    def __init__(self, recording: list[EventType]) -> None:
+        self.recording = recording
+
+        starts = [e for e in recording if isinstance(e, EventGameStarted)]
+        if not starts or starts[0].seed is None:
+            raise ValueError("The recording has no seed to replay the game from.")
+
+        self.seed = starts[0].seed
+        self.moves: dict[int, deque[MoveType]] = {
+            player.player_id: deque() for player in starts[0].players
+        }
+
+        for e in recording:
+            if isinstance(e, (MovePlaceTile, MovePlaceMeeple, MovePlaceMeeplePass)):
+                self.moves[e.player_id].append(e)
+
+    @staticmethod
+    def from_file(path: str) -> "Replay":
+        with open(path) as f:
+            return Replay(RecordingAdapter.validate_json(f.read()))
+
+    def run(self) -> GameResult:
+        self.engine = GameEngine(
+            agents=[self._get_agent(player_id) for player_id in sorted(self.moves)],
+            seed=self.seed,
+        )
+
+        try:
+            return self.engine.start()
+
+        except ReplayExhaustedError as e:
+            # The player was banned for a move that was never committed
+            ban = self.recording[-1]
+            if not isinstance(ban, EventPlayerBanned) or ban.player_id != e.player_id:
+                raise
+
+            self.engine.mutator.commit(ban)
+            return self.engine.finish()
+
+    def matches_recording(self) -> bool:
+        return RootModel(self.engine.state.event_history).model_dump_json() == (
+            RootModel(self.recording).model_dump_json()
+        )
+
+    def _get_agent(self, player_id: int) -> Agent:
+        moves = self.moves[player_id]
+
+        def agent(query: QueryType) -> MoveType:
+            if not moves:
+                raise ReplayExhaustedError(player_id)
+
+            return moves.popleft()
+
+        return agent
@@ -1,27 +1,36 @@
 from engine.config.expansion_config import EXPANSION_PACKS
 from engine.config.game_config import NUM_PLAYERS
 from engine.game.tile_subscriber import TilePublisherBus
+from engine.interface.io.local_connection import Agent
+from engine.interface.io.pipe_selector import PipeSelector
 from engine.state.player_state import PlayerState
-from engine.config.io_config import CORE_DIRECTORY
+from engine.config.io_config import CORE_DIRECTORY, OPEN_PIPE_TIMEOUT_MS
 
-from lib.game.game_logic import GameLogic
+from lib.game.game_logic import GameLogic, JournalFrame
+from lib.interact.meeple import Meeple
 from lib.interact.tile import Tile
 from lib.interact.map import Map
 from lib.interface.events.typing import EventType
 
+from typing import Any, Sequence
+
 import json
 
 
 class GameState(GameLogic):
-    def __init__(self) -> None:
-        with open(f"{CORE_DIRECTORY}/input/catalog.json", "r") as f:
-            self.catalog = json.load(f)
+    def __init__(self, catalog: list[dict[str, Any]] | None = None) -> None:
+        if catalog is None:
+            with open(f"{CORE_DIRECTORY}/input/catalog.json", "r") as f:
+                catalog = json.load(f)
+
+        self.catalog = catalog
 
         self.round = -1
         self.players: dict[int, PlayerState] = {
             i: PlayerState(i, self.catalog[i]["team_id"]) for i in range(NUM_PLAYERS)
         }
         self.map = Map()
+        self.journal: list[JournalFrame] = []
 
         self.game_over = False
         self.tiles_exhausted = True
@@ -35,9 +44,22 @@ class GameState(GameLogic):
 
         self.river_phase = True
 
-    def _connect_players(self) -> None:
+    def _connect_players(self, agents: Sequence[Agent] | None = None) -> None:
+        if agents is not None:
+            for player in self.players.values():
+                player.connect(agents[player.id])
+
+            return
+
+        # Bots open their pipes concurrently, startup waits on the slowest only
+        selector = PipeSelector()
         for player in self.players.values():
-            player.connect()
+            player.connect(selector=selector)
+
+        selector.open_pipes(
+            OPEN_PIPE_TIMEOUT_MS,
+            "You didn't open 'to_engine' for writing or 'from_engine.pipe' for reading in time.",
+        )
 
     def start_river_phase(self) -> None:
         self.map.start_river_phase()
@@ -80,3 +102,15 @@ class GameState(GameLogic):
                 return player
 
         return None
+
+    def _get_available_meeple(self, player_id: int) -> Meeple | None:
+        return self.players[player_id]._get_available_meeple()
+
+    def _add_meeples(self, player_id: int, count: int) -> None:
+        """
+        Meeples are self update. No count tracked on engine
+        """
+        pass
+
+    def _add_points(self, player_id: int, points: int) -> None:
+        self.players[player_id].points += points
@@ -1,5 +1,8 @@
 from engine.config.game_config import NUM_MEEPLES
+from engine.interface.io.base_connection import BaseConnection
+from engine.interface.io.local_connection import Agent, LocalPlayerConnection
 from engine.interface.io.player_connection import PlayerConnection
+from engine.interface.io.pipe_selector import PipeSelector
 
 from lib.interact.meeple import Meeple
 from lib.interact.tile import Tile
@@ -13,10 +16,16 @@ class PlayerState:
         self.points = 0
         self.tiles: list[Tile] = []
         self.meeples: list["Meeple"] = [Meeple(player_id) for _ in range(NUM_MEEPLES)]
-        self.connection: PlayerConnection
-
-    def connect(self) -> None:
-        self.connection = PlayerConnection(self.id)
+        self.connection: BaseConnection
+
+    def connect(
+        self, agent: Agent | None = None, selector: PipeSelector | None = None
+    ) -> None:
+        if agent is not None:
+            self.connection = LocalPlayerConnection(self.id, agent)
+        else:
+            assert selector is not None
+            self.connection = PlayerConnection(self.id, selector)
 
     def _get_available_meeple(self) -> Meeple | None:
         available_meeples = [m for m in self.meeples if m.placed is None]
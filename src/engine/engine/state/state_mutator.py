@@ -3,6 +3,7 @@ from engine.state.game_state import GameState
 
 from lib.config.map_config import MONASTARY_IDENTIFIER
 from lib.config.scoring import POINT_LIMIT
+from lib.game.structure_index import StructureComponent
 from lib.interface.events.event_player_bannned import EventPlayerBanned
 from lib.interface.events.event_player_turn_started import EventPlayerTurnStarted
 from lib.interface.events.event_player_won import EventPlayerWon
@@ -88,24 +89,32 @@ class StateMutator:
         """
         # Get tile from player hand
         tile = self.state.players[move.player_id].tiles.pop(move.player_tile_index)
-        while tile.rotation != move.tile.rotation:
-            tile.rotate_clockwise(1)
+        tile.rotate_to(move.tile.rotation)
 
-        self.state.map._grid[move.tile.pos[1]][move.tile.pos[0]] = tile
-        self.state.map.placed_tiles.append(tile)
+        self.state.map.place_tile(tile, move.tile.pos)
 
         # Keep track of tile placed for meeple placement
         self.state.tile_placed = tile
-        tile.placed_pos = move.tile.pos
 
         # Check for any complete connected componentes
         completed_components = self.state.check_any_complete(tile)
 
         player_point_limit = -1
 
-        # Check for base/regular connected components
+        # Check for base/regular connected components, once per component
+        rewarded_components: dict[StructureComponent, bool] = {}
+
         for edge in completed_components:
-            reward = self.state._get_reward(tile, edge)
+            component = self.state._get_component(tile, edge)
+            assert component is not None
+
+            if component in rewarded_components:
+                if rewarded_components[component]:
+                    self.state.tile_placed_claims.add(edge)
+
+                continue
+
+            reward = component.get_reward()
 
             claims = self.state._get_claims(tile, edge)
             for player_id in claims:
@@ -117,25 +126,24 @@ class StateMutator:
                     if player.points >= POINT_LIMIT:
                         player_point_limit = player.id
 
+            rewarded_components[component] = bool(claims)
             if claims:
                 self.state.tile_placed_claims.add(edge)
 
-            meeples_to_return = list(
-                self.state._traverse_connected_component(
-                    tile,
-                    edge,
-                    yield_cond=lambda t, e: t.internal_claims[e] is not None,
-                )
-            )
+            meeples_to_return = [
+                returning
+                for meeples in self.state._get_claims_objs(tile, edge).values()
+                for returning in meeples
+            ]
 
-            for t, e in meeples_to_return:
-                meeple = t.internal_claims[e]
-                assert meeple is not None
+            for returning in meeples_to_return:
+                t, e = returning.placed, returning.placed_edge
+                assert t is not None
 
-                meeple._free_meeple()
+                self.state._free_meeple(returning)
                 self.commit(
                     EventPlayerMeepleFreed(
-                        player_id=meeple.player_id,
+                        player_id=returning.player_id,
                         reward=reward,
                         tile=t._to_model(),
                         placed_on=e,
@@ -156,7 +164,7 @@ class StateMutator:
                 meeple = t.internal_claims[reward_edge]
                 assert meeple is not None
 
-                meeple._free_meeple()
+                self.state._free_meeple(meeple)
                 self.commit(
                     EventPlayerMeepleFreed(
                         player_id=player_id,
@@ -180,9 +188,7 @@ class StateMutator:
         meeple = player._get_available_meeple()
         assert meeple is not None
 
-        meeple._place_meeple(self.state.tile_placed, move.placed_on)
-
-        completed_components = self.state.check_any_complete(self.state.tile_placed)
+        self.state._place_meeple(meeple, self.state.tile_placed, move.placed_on)
 
         # This segment checks if player placed a meeple on a completed tile
         if move.placed_on == MONASTARY_IDENTIFIER:
@@ -201,7 +207,7 @@ class StateMutator:
                     meeple = t.internal_claims[e]
                     assert meeple is not None
 
-                    meeple._free_meeple()
+                    self.state._free_meeple(meeple)
                     self.commit(
                         EventPlayerMeepleFreed(
                             player_id=player_id,
@@ -212,7 +218,9 @@ class StateMutator:
                     )
 
         # Check the player completed a reguar component and claimed
-        elif move.placed_on in completed_components:
+        elif self.state._check_completed_component(
+            self.state.tile_placed, move.placed_on
+        ):
             player.points += self.state._get_reward(
                 self.state.tile_placed, move.placed_on
             )
@@ -1,5 +1,6 @@
 from lib.config.map_config import MAX_MAP_LENGTH, MONASTARY_IDENTIFIER
-from lib.game.game_logic import GameLogic
+from lib.game.game_logic import GameLogic, JournalFrame
+from lib.game.tile_table import get_fitting
 from lib.interact.meeple import Meeple
 from lib.interact.map import Map
 from lib.interact.tile import Tile, TileModifier
@@ -9,6 +10,8 @@ from lib.models.tile_model import TileModel
 from lib.interact.structure import StructureType
 
 from copy import deepcopy
+from itertools import chain
+from typing import Mapping
 
 
 class ClientSate(GameLogic):
@@ -17,6 +20,7 @@ class ClientSate(GameLogic):
         self.players: dict[int, PublicPlayerModel]
         self.players_meeples: dict[int, int]
         self.map = Map()
+        self.journal: list[JournalFrame] = []
 
         self.game_over = False
         self.num_placed_tiles = 0
@@ -29,6 +33,107 @@ class ClientSate(GameLogic):
         self.me: PlayerModel
         self.my_tiles: list[Tile] = []
 
+        # Remaining tile types that fit each frontier cell, with the constraint
+        # they were found for, see get_fitting_types
+        self._fit_index: dict[tuple[int, int], tuple[int, set[str]]] = {}
+
+    def _get_available_meeple(self, player_id: int) -> Meeple | None:
+        if self.players_meeples[player_id] <= 0:
+            return None
+
+        return Meeple(player_id)
+
+    def _add_meeples(self, player_id: int, count: int) -> None:
+        self.players_meeples[player_id] += count
+
+        if player_id == self.me.player_id:
+            self.me.num_meeples += count
+
+    def _add_points(self, player_id: int, points: int) -> None:
+        self.players[player_id].points += points
+
+        if player_id == self.me.player_id:
+            self.me.points += points
+
+    def _take_tile(self, tile_type: str) -> Tile:
+        """
+        Takes a tile we have seen drawn or placed out of the remaining tiles
+        """
+        tile = self.map.get_tile_by_type(tile_type, pop=True)
+
+        # The last tile of its type no longer fits anywhere
+        if not self.map.available_tiles.counts[tile_type]:
+            for _, types in self._fit_index.values():
+                types.discard(tile_type)
+
+        return tile
+
+    def _start_base_phase(self) -> None:
+        self.map.start_base_phase()
+
+        # Base tiles fit cells the river tiles did not
+        self._fit_index.clear()
+
+    def get_remaining_counts(self) -> Mapping[str, int]:
+        """
+        Get Remaining Counts
+        Tiles not seen yet by type, those left to draw and those in opponents' hands
+        """
+        return self.map.available_tiles.counts
+
+    def get_draw_probability(self, tile_type: str) -> float:
+        """
+        Get Draw Probability
+        Chance the next tile drawn is of the given type, opponents' hands being
+        unknown they count as part of the draw pile
+        """
+        return self.map.available_tiles.get_probability(tile_type)
+
+    def get_fitting_types(self, pos: tuple[int, int]) -> set[str]:
+        """
+        Get Fitting Types
+        Remaining tile types with a rotation whose edges fit the frontier cell,
+        river rules aside. Cached per cell until its constraint changes
+        """
+        constraint = self.map.frontier[pos]
+        entry = self._fit_index.get(pos)
+
+        if entry is None or entry[0] != constraint:
+            counts = self.get_remaining_counts()
+            entry = self._fit_index[pos] = (
+                constraint,
+                {
+                    tile_type
+                    for tile_type in get_fitting(constraint)
+                    if counts.get(tile_type, 0)
+                },
+            )
+
+        return entry[1]
+
+    def get_fit_probability(self, pos: tuple[int, int]) -> float:
+        """
+        Get Fit Probability
+        Chance the next tile drawn fits the frontier cell in some rotation
+        """
+        counts = self.get_remaining_counts()
+        remaining = len(self.map.available_tiles)
+        if not remaining:
+            return 0.0
+
+        return sum(counts[t] for t in self.get_fitting_types(pos)) / remaining
+
+    def get_fit_index(self) -> dict[tuple[int, int], set[str]]:
+        """
+        Get Fit Index
+        Fitting types of every frontier cell
+        """
+        # Cells filled since their last lookup are dropped
+        for pos in self._fit_index.keys() - self.map.frontier.keys():
+            del self._fit_index[pos]
+
+        return {pos: self.get_fitting_types(pos) for pos in self.map.frontier}
+
     def get_meeples_placed_by(self, player_id: int | None) -> list[Meeple]:
         """
         Get Meeples Placed
@@ -37,7 +142,7 @@ class ClientSate(GameLogic):
         meeples = []
         for x in range(MAX_MAP_LENGTH):
             for y in range(MAX_MAP_LENGTH):
-                tile = self.map._grid[y][x]
+                tile = self.map._grid.get(x, y)
 
                 if tile is None:
                     continue
@@ -51,15 +156,14 @@ class ClientSate(GameLogic):
     def get_tile_structures(self, tile: TileModel) -> dict[str, StructureType]:
         # Does not return monastary
         found_tile: Tile | None = None
-        for t in self.map.available_tiles.union(set(self.map.placed_tiles)):
+        for t in chain(self.map.available_tiles, self.map.placed_tiles):
             if tile.tile_type == t.tile_type:
                 found_tile = t
 
         assert found_tile
         found_tile = deepcopy(found_tile)
 
-        while found_tile.rotation != tile.rotation:
-            found_tile.rotate_clockwise(1)
+        found_tile.rotate_to(tile.rotation)
 
         return {
             edge: structure for edge, structure in found_tile.internal_edges.items()
@@ -75,7 +179,7 @@ class ClientSate(GameLogic):
         print(placable_structures, flush=True)
 
         x, y = my_tile.pos
-        tile = self.map._grid[y][x]
+        tile = self.map._grid.get(x, y)
 
         assert tile is not None
 
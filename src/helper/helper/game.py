@@ -1,4 +1,4 @@
-from lib.interact.tile import StructureType, Tile
+from lib.interact.tile import Tile
 from lib.interface.queries.query_place_tile import QueryPlaceTile
 from lib.interface.queries.query_place_meeple import QueryPlaceMeeple
 from lib.interface.queries.typing import QueryType
@@ -15,22 +15,30 @@ from lib.models.tile_model import TileModel
 
 
 class Game:
-    def __init__(self) -> None:
+    def __init__(self, connect: bool = True) -> None:
+        """
+        Passing connect as False skips opening the engine pipes, queries are
+        then handed to update by an in process (headless) engine
+        """
         self.state = ClientSate()
         self.mutator = StateMutator(self.state)
-        self.connection = Connection()
+        self.connection = Connection() if connect else None
 
     def get_next_query(self) -> QueryType:
+        assert self.connection is not None
         query = self.connection.get_next_query()
+        self.update(query)
 
+        return query
+
+    def update(self, query: QueryType) -> None:
         new_events_mark = len(self.state.event_history)
         for i, record in query.update.items():
             self.mutator.commit(i, record)
         self.state.new_events = new_events_mark
 
-        return query
-
     def send_move(self, move: MoveType) -> None:
+        assert self.connection is not None
         self.connection.send_move(move)
 
     def move_place_tile(
@@ -53,61 +61,16 @@ class Game:
         )
 
     def can_place_tile_at(self, tile: Tile, x: int, y: int) -> bool:
-        if self.state.map._grid[y][x]:
-            return False  # Already occupied
-
-        directions = {
-            (0, -1): "top_edge",
-            (1, 0): "right_edge",
-            (0, 1): "bottom_edge",
-            (-1, 0): "left_edge",
-        }
-
-        edge_opposite = {
-            "top_edge": "bottom_edge",
-            "bottom_edge": "top_edge",
-            "left_edge": "right_edge",
-            "right_edge": "left_edge",
-        }
-
-        print(f"Checking if tile can be placed {x, y}")
-        has_any_neighbour = False
+        """
+        Rotates the tile until it fits at (x, y), leaving it rotated as it was
+        when no rotation fits. Only edges are checked, not river rules
+        """
+        if (x, y) not in self.state.map.frontier:
+            return False  # Occupied or no neighbours
 
         for _ in range(4):  # Try all 4 rotations
-            has_any_neighbour = False  # reset for each rotation
-
-            for (dx, dy), edge in directions.items():
-                nx, ny = x + dx, y + dy
-
-                print(
-                    f"Checking if tile neighbour compatible - {nx, ny} with rotation {tile.rotation}"
-                )
-
-                if not (
-                    0 <= ny < len(self.state.map._grid)
-                    and 0 <= nx < len(self.state.map._grid[0])
-                ):
-                    continue
-
-                neighbour_tile = self.state.map._grid[ny][nx]
-
-                if neighbour_tile is None:
-                    continue
-
-                has_any_neighbour = True
-                # print(tile.internal_edges[edge], edge, tile.rotation, tile.tile_type)
-                # print(neighbour_tile.internal_edges[edge_opposite[edge]])
-                if not StructureType.is_compatible(
-                    tile.internal_edges[edge],
-                    neighbour_tile.internal_edges[edge_opposite[edge]],
-                ):
-                    print("Edge Missmatch")
-                    break  # mismatch, try next rotation
-
-            else:
-                if has_any_neighbour:
-                    print("Returning True")
-                    return True
+            if self.state.map.can_fit(tile, (x, y)):
+                return True
 
             tile.rotate_clockwise(1)
 
@@ -1,51 +1,71 @@
-import math
+import json
+import os
 
+from lib.interface.io.pipe_reader import MalformedSizeError, PipeReader
+from lib.interface.io.shared_ring import (
+    DOORBELL,
+    RING_NAMES_FILE,
+    SharedRing,
+    SharedRingReader,
+)
 from lib.interface.queries.typing import QueryType, QueryTypeAdapter
 from lib.interface.events.moves.typing import MoveType
 
 MAX_CHARACTERS_READ = 1000000
-READ_CHUNK_SIZE = 1024
 
 
 class Connection:
     def __init__(self) -> None:
-        self._to_engine_pipe = open("./io/to_engine.pipe", "w")
-        self._from_engine_pipe = open("./io/from_engine.pipe", "r")
+        self._to_engine_pipe = open("./io/to_engine.pipe", "wb")
+        from_engine_fd = os.open("./io/from_engine.pipe", os.O_RDONLY)
+
+        # The engine names its rings before opening the pipes, when it uses them
+        self._to_engine_ring: SharedRing | None = None
+        self._from_engine_pipe: PipeReader | SharedRingReader
+
+        if os.path.exists(f"./io/{RING_NAMES_FILE}"):
+            with open(f"./io/{RING_NAMES_FILE}") as f:
+                names = json.load(f)
+
+            self._to_engine_ring = SharedRing.attach(names["to_engine"])
+            self._from_engine_pipe = SharedRingReader(
+                from_engine_fd, SharedRing.attach(names["from_engine"])
+            )
+        else:
+            self._from_engine_pipe = PipeReader(from_engine_fd, MAX_CHARACTERS_READ)
 
     def _send(self, data: str) -> None:
-        self._to_engine_pipe.write(str(len(data)) + ",")
-        self._to_engine_pipe.write(data)
+        payload = data.encode()
+        if self._to_engine_ring is None:
+            self._to_engine_pipe.write(str(len(payload)).encode() + b"," + payload)
+        else:
+            self._to_engine_ring.push(payload)
+            self._to_engine_pipe.write(DOORBELL)
+
         self._to_engine_pipe.flush()
 
+    def close(self) -> None:
+        self._to_engine_pipe.close()
+        self._from_engine_pipe.close()
+
+        if self._to_engine_ring is not None:
+            self._to_engine_ring.close()
+
     def _receive(self) -> str:
-        # Read size of message.
-        buffer = bytearray()
-        while len(buffer) < math.floor(math.log10(MAX_CHARACTERS_READ)) + 1 and (
-            len(buffer) == 0 or buffer[-1] != ord(",")
-        ):
-            buffer.extend(self._from_engine_pipe.read(1).encode())
-
-        if buffer[-1] == ord(","):
-            size = int(buffer[0:-1].decode())
-        else:
-            print(buffer)
+        try:
+            size = self._from_engine_pipe.read_size()
+        except MalformedSizeError as e:
+            print(e)
             raise RuntimeError("Please send us a discord message with this error log.")
+        except EOFError:
+            # The game is over, pooled bot processes go on to the next one
+            self.close()
+            raise
 
         if size > MAX_CHARACTERS_READ:
             raise RuntimeError("Please send us a discord message with this error log.")
 
-        # Read message.
-        buffer = bytearray()
-        while len(buffer) < size:
-            buffer.extend(
-                bytearray(
-                    self._from_engine_pipe.read(
-                        min((size - len(buffer)), READ_CHUNK_SIZE)
-                    ).encode()
-                )
-            )
-
-        return buffer.decode()
+        return self._from_engine_pipe.read_payload(size)
 
     def get_next_query(self) -> QueryType:
         return QueryTypeAdapter.model_validate_json(self._receive()).root
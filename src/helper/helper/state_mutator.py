@@ -103,7 +103,7 @@ class StateMutator:
 
         self.state.me.tiles.extend(e.tiles)
         for tile_model in e.tiles:
-            tile = self.state.map.get_tile_by_type(tile_model.tile_type, pop=True)
+            tile = self.state._take_tile(tile_model.tile_type)
 
             self.state.my_tiles.append(tile)
             self.state.players[e.player_id].num_tiles += 1
@@ -130,14 +130,14 @@ class StateMutator:
 
     def _commit_event_player_meeple_freed(self, e: EventPlayerMeepleFreed) -> None:
         x, y = e.tile.pos
-        tile = self.state.map._grid[y][x]
+        tile = self.state.map._grid.get(x, y)
 
         assert tile is not None
-        tile.internal_claims[e.placed_on] = None
-        self.state.players_meeples[e.player_id] += 1
+        meeple = tile.internal_claims[e.placed_on]
+        assert meeple is not None
 
-        if e.player_id == self.state.me.player_id:
-            self.state.me.num_meeples += 1
+        self.state._free_meeple(meeple)
+        self.state._add_meeples(e.player_id, 1)
 
     def _commit_event_starting_tile_placed(self, e: EventStartingTilePlaced) -> None:
         self.state.map.place_river_start(e.tile_placed.pos)
@@ -146,39 +146,27 @@ class StateMutator:
         if e.player_id != self.state.me.player_id:
             raise RuntimeError("Please send us a discord message with this error log.")
 
-        x, y = e.tile.pos
         tile = self.state.my_tiles.pop(e.player_tile_index)
-        tile.placed_pos = x, y
+        assert tile.rotation == e.tile.rotation
 
-        self.state.map._grid[y][x] = tile
-        self.state.map.placed_tiles.append(tile)
+        self.state.map.place_tile(tile, e.tile.pos)
         self.state.players[e.player_id].num_tiles -= 1
 
-        assert tile.rotation == e.tile.rotation
-
     def _commit_public_move_place_tile(self, e: PublicMovePlaceTile) -> None:
         self.state.players[e.player_id].num_tiles -= 1
 
-        x, y = e.tile.pos
-        tile = self.state.map.get_tile_by_type(e.tile.tile_type, pop=True)
+        tile = self.state._take_tile(e.tile.tile_type)
+        tile.rotate_to(e.tile.rotation)
 
-        tile.placed_pos = x, y
-        self.state.map._grid[y][x] = tile
-        self.state.map.placed_tiles.append(tile)
-        while tile.rotation != e.tile.rotation:
-            tile.rotate_clockwise(1)
+        self.state.map.place_tile(tile, e.tile.pos)
 
     def _commit_move_place_meeple(self, e: MovePlaceMeeple) -> None:
-        self.state.players_meeples[e.player_id] -= 1
-
         x, y = e.tile.pos
-        tile = self.state.map._grid[y][x]
+        tile = self.state.map._grid.get(x, y)
 
         assert tile is not None
-        tile.internal_claims[e.placed_on] = Meeple(e.player_id)
-
-        if e.player_id == self.state.me.player_id:
-            self.state.me.num_meeples -= 1
+        self.state._place_meeple(Meeple(e.player_id), tile, e.placed_on)
+        self.state._add_meeples(e.player_id, -1)
 
     def _commit_move_place_meeple_pass(self, e: MovePlaceMeeplePass) -> None:
         pass
@@ -205,4 +193,4 @@ class StateMutator:
 
     def _commit_event_river_phase_completed(self, e: EventRiverPhaseCompleted) -> None:
         self.state.map.place_river_end(e.end_tile.pos, e.end_tile.rotation)
-        self.state.map.start_base_phase()
+        self.state._start_base_phase()
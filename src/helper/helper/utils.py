@@ -1,7 +1,7 @@
-from lib.interact.tile import Tile
+from lib.interact.board import GridType
 
 
-def print_map(grid: list[list["Tile | None"]], print_range: range) -> None:
+def print_map(grid: GridType, print_range: range) -> None:
     assert grid
     assert len(grid) >= len(print_range)
 
@@ -0,0 +1,80 @@
+"""
+Worker
+_Keeps a bot process warm between matches, run as python3 -m helper.worker_
+
+Each line read from stdin is a new game message, a json object with the player
+directory of the match. The submission in that directory is run from the top as its
+own __main__, with its directory first on sys.path and its output sent to the
+directory's io logs as a fresh process would. Modules it imports from its directory
+are dropped afterwards, so bot state never carries over between matches while the
+interpreter, pydantic, lib and helper stay imported. The game is over when the engine closes
+its pipes, then "ready" is written to stdout for the pool.
+"""
+
+from helper.game import Game  # noqa: F401 (imported once for every match)
+
+import json
+import os
+import runpy
+import sys
+import traceback
+
+READY_MESSAGE = "ready\n"
+
+
+def play(directory: str) -> None:
+    os.chdir(directory)
+    sys.argv = ["submission.py"]
+
+    with (
+        open("io/submission.log", "w") as f_log,
+        open("io/submission.err", "w") as f_err,
+    ):
+        os.dup2(f_log.fileno(), 1)
+        os.dup2(f_err.fileno(), 2)
+
+        sys.path.insert(0, directory)
+        try:
+            runpy.run_path("submission.py", run_name="__main__")
+
+        # Raised by the helper once the engine closes the pipes
+        except (EOFError, BrokenPipeError, SystemExit):
+            pass
+
+        except Exception:
+            traceback.print_exc()
+
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+            sys.path.remove(directory)
+            _unload_modules(directory)
+
+
+def _unload_modules(directory: str) -> None:
+    """
+    Drops modules imported from the submission directory, they are imported again
+    by the next match that needs them
+    """
+    prefix = os.path.join(directory, "")
+
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path is not None and os.path.abspath(path).startswith(prefix):
+            del sys.modules[name]
+
+
+def main() -> None:
+    # Keep the pool's end of stdout before the match logs take over fd 1
+    control = os.fdopen(os.dup(1), "w")
+
+    for line in sys.stdin:
+        play(json.loads(line)["directory"])
+
+        control.write(READY_MESSAGE)
+        control.flush()
+
+
+if __name__ == "__main__":
+    main()
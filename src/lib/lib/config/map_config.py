@@ -48,6 +48,10 @@ tile_counts = DotMap(
     _dynamic=False,
 )
 
+# Stable ids of tile types, used to pack tiles into board cells
+TILE_TYPES: list[str] = list(tile_counts.keys())
+TILE_TYPE_IDS: dict[str, int] = {tile_type: i for i, tile_type in enumerate(TILE_TYPES)}
+
 NUM_PLACEABLE_TILE_TYPES = 9
 
 TILE_EDGE_IDS: dict[str, int] = {
@@ -61,5 +65,5 @@ TILE_EXTERNAL_POS: dict[str, Callable[[int, int], tuple[int, int]]] = {
     "top_edge": lambda x, y: (x, y - 1),
     "right_edge": lambda x, y: (x + 1, y),
     "bottom_edge": lambda x, y: (x, y + 1),
-    "left_edge": lambda x, y: (x - 1, y - 1),
+    "left_edge": lambda x, y: (x - 1, y),
 }
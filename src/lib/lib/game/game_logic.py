@@ -1,21 +1,54 @@
 from lib.config.map_config import MONASTARY_IDENTIFIER
+from lib.config.scoring import MONASTARY_POINTS
+from lib.game.structure_index import StructureComponent, UndoEntry
+from lib.game.tile_table import get_fitting
+from lib.interact.edge import EDGE_IDS, EDGE_OFFSETS, EDGES, Edge
 from lib.interact.map import Map
 from lib.interact.meeple import Meeple
 from lib.interact.structure import StructureType
 from lib.interact.tile import Tile, TileModifier
+from lib.interact.tile_edges import EDGE_KEYS, TileEdges
 
-from collections import defaultdict, deque
-from typing import Callable, Iterator, Protocol
+from typing import Iterator, Protocol, TypeAlias
+
+# (tile index in hand, position, rotation)
+TileMove: TypeAlias = tuple[int, tuple[int, int], int]
+
+# Structure index mark and the undo entries of one applied move
+JournalFrame: TypeAlias = tuple[int, list[UndoEntry]]
 
 
 class SharedGameState(Protocol):
     map: Map
+    journal: list[JournalFrame]
+
+    def _get_available_meeple(self, player_id: int) -> Meeple | None:
+        """
+        Meeple the player would place next, None if all are placed
+        """
+        ...
+
+    def _add_meeples(self, player_id: int, count: int) -> None:
+        """
+        Meeple count bookkeeping for states that keep a count next to the meeples
+        """
+        ...
+
+    def _add_points(self, player_id: int, points: int) -> None: ...
 
 
 class GameLogic(SharedGameState):
-    def _get_claims_objs(self, tile: "Tile", edge: str) -> dict[int, list[Meeple]]:
-        players = defaultdict(list)
+    def _get_component(self, tile: "Tile", edge: str) -> StructureComponent | None:
+        """
+        Road or city through an edge given by name, None for any other edge
+        """
+        edge_id = EDGE_IDS.get(edge)
+        if edge_id is None:
+            return None
 
+        return self.map.structures.get_component(tile, edge_id)
+
+    def _get_claims_objs(self, tile: "Tile", edge: str) -> dict[int, list[Meeple]]:
         if edge == MONASTARY_IDENTIFIER:
             m = tile.internal_claims[edge]
             if not m:
@@ -23,16 +56,15 @@ class GameLogic(SharedGameState):
 
             return {m.player_id: [m]}
 
-        for connected_tile, e in self._traverse_connected_component(tile, edge):
-            meeple = connected_tile.internal_claims[e]
-            if meeple is not None:
-                players[meeple.player_id].append(meeple)
+        component = self._get_component(tile, edge)
+        if component is None:
+            return {}
 
-        return players
+        return {
+            player_id: list(meeples) for player_id, meeples in component.meeples.items()
+        }
 
     def _get_claims(self, tile: "Tile", edge: str) -> list[int]:
-        players: set[int] = set()
-
         if edge == MONASTARY_IDENTIFIER:
             m = tile.internal_claims[edge]
             if not m:
@@ -40,134 +72,281 @@ class GameLogic(SharedGameState):
 
             return [m.player_id]
 
-        for connected_tile, e in self._traverse_connected_component(tile, edge):
-            meeple = connected_tile.internal_claims[e]
-            if meeple is not None:
-                players.add(meeple.player_id)
+        component = self._get_component(tile, edge)
+        if component is None:
+            return []
 
-        return list(players)
+        return list(component.meeples)
 
     def _get_reward(self, tile: "Tile", edge: str, partial: bool = False) -> int:
-        visited_tiles = set()
-        structure_type = tile.internal_edges[edge]
+        component = self._get_component(tile, edge)
+        if component is None:
+            return 0
 
-        total_points = 0
+        return component.get_reward(partial)
+
+    def _check_completed_component(self, start_tile: Tile, edge: str) -> bool:
+        component = self._get_component(start_tile, edge)
+        return component is not None and component.is_complete()
 
-        for connected_tile, _ in self._traverse_connected_component(tile, edge):
-            if connected_tile in visited_tiles:
+    def check_any_complete(self, start_tile: "Tile") -> list[str]:
+        """
+        Edges of the tile whose road or city has no unmatched edges left,
+        edges of one structure are all listed
+        """
+        return [
+            edge
+            for edge in start_tile.internal_edges
+            if self._check_completed_component(start_tile, edge)
+        ]
+
+    def _place_meeple(self, meeple: Meeple, tile: "Tile", edge: str) -> None:
+        meeple._place_meeple(tile, edge)
+
+        edge_id = EDGE_IDS.get(edge)
+        if edge_id is not None:
+            self.map.structures.claim(tile, edge_id, meeple)
+
+    def _free_meeple(self, meeple: Meeple) -> None:
+        assert meeple.placed is not None
+
+        edge_id = EDGE_IDS.get(meeple.placed_edge)
+        if edge_id is not None:
+            self.map.structures.release(meeple.placed, edge_id, meeple)
+
+        meeple._free_meeple()
+
+    def legal_tile_moves(self, hand: list["Tile"]) -> Iterator[TileMove]:
+        """
+        Legal Tile Moves
+        _Yields every (tile index, position, rotation) the move validator accepts_
+
+        Rotations with the same edges are all listed.
+        """
+        for pos, constraint in self.map.frontier.items():
+            fitting = get_fitting(constraint)
+
+            for tile_index, tile in enumerate(hand):
+                for rotation in fitting.get(tile.tile_type, ()):
+                    if self._is_river_legal(tile.type.get_edges(rotation), pos):
+                        yield tile_index, pos, rotation
+
+    def legal_meeple_moves(self, tile: "Tile") -> Iterator[str]:
+        """
+        Legal Meeple Moves
+        _Yields the edges (and monastary) of a just placed tile a meeple may claim_
+
+        Does not check whether the player has a meeple left.
+        """
+        for edge in EDGE_KEYS:
+            if not StructureType.can_claim(tile.internal_edges[edge]):
                 continue
 
-            visited_tiles.add(connected_tile)
+            component = self._get_component(tile, edge)
+            if component is None or component.meeples or component.scored:
+                continue
 
-            if not partial:
-                total_points += StructureType.get_points(structure_type)
+            yield edge
+
+        if TileModifier.MONASTARY in tile.modifiers:
+            yield MONASTARY_IDENTIFIER
+
+    def get_dead_cells(self) -> set[tuple[int, int]]:
+        """
+        Get Dead Cells
+        _Frontier cells no tile left in the game fits by its edges_
+
+        Kept up to date by the map as tiles are placed and taken back.
+        """
+        return self.map.dead_cells
+
+    def get_unfinishable_components(self) -> list[StructureComponent]:
+        """
+        Get Unfinishable Components
+        _Roads and cities with an open edge on a dead cell, they can never complete_
+
+        Found once after each change to the map and kept until the next one.
+        """
+        return list(self.map.get_unfinishable_components())
+
+    def is_finishable(self, tile: "Tile", edge: str) -> bool:
+        """
+        Is Finishable
+        _False for a road or city through the edge that can never complete_
+        """
+        component = self._get_component(tile, edge)
+
+        return (
+            component is None or component not in self.map.get_unfinishable_components()
+        )
+
+    def _is_river_legal(self, edges: TileEdges, pos: tuple[int, int]) -> bool:
+        """
+        A tile with river edges has to continue the river without turning back,
+        tiles without river edges are always legal
+        """
+        grid = self.map._grid
+        x, y = pos
+
+        has_river = False
+        connected = False
+
+        for edge in EDGES:
+            if edges.by_id[edge] != StructureType.RIVER:
+                continue
 
-            else:
-                total_points += StructureType.get_partial_points(structure_type)
+            has_river = True
+            dx, dy = EDGE_OFFSETS[edge]
 
-            total_points = TileModifier.apply_point_modifiers(
-                tile.modifiers, total_points
-            )
+            if not grid.is_empty(x + dx, y + dy):
+                connected = True
 
-        return total_points
+            elif self._leads_to_u_turn(pos, edge):
+                return False
 
-    def _check_completed_component(self, start_tile: Tile, edge: str) -> bool:
-        component = list(self._traverse_connected_component(start_tile, edge))
+        return connected or not has_river
+
+    def _leads_to_u_turn(self, pos: tuple[int, int], edge: Edge) -> bool:
+        """
+        An open river edge at pos is next to a placed tile one or two cells out
+        """
+        grid = self.map._grid
+        x, y = pos
+        dx, dy = EDGE_OFFSETS[edge]
+
+        # Surroundings of the cell the river flows into, other than pos
+        for ox, oy in EDGE_OFFSETS:
+            cx, cy = x + dx + ox, y + dy + oy
+            if (cx, cy) != pos and not grid.is_empty(cx, cy):
+                return True
+
+        # Surroundings of the cell two out
+        for ox, oy in EDGE_OFFSETS:
+            if not grid.is_empty(x + 2 * dx + ox, y + 2 * dy + oy):
+                return True
+
+        return False
+
+    def apply_tile(self, hand: list["Tile"], move: TileMove) -> "Tile":
+        """
+        Apply Tile
+        _Places a tile from the hand as a journaled move, taken back with undo_
+
+        Completed roads and cities are scored and their meeples returned as the engine
+        does, and so are completed monastaries.
+        """
+        tile_index, pos, rotation = move
+        undo = self._open_frame()
+
+        tile = hand.pop(tile_index)
+        undo.append((hand.insert, (tile_index, tile)))
+        undo.append((tile.rotate_to, (tile.rotation,)))
+        undo.append((setattr, (tile, "placed_pos", tile.placed_pos)))
+
+        frontier = self.map.get_frontier_around(pos)
+
+        tile.rotate_to(rotation)
+        self.map.place_tile(tile, pos)
+        undo.append((self.map.remove_tile, (tile, frontier)))
+
+        rewarded: set[StructureComponent] = set()
+        for edge in EDGES:
+            component = self.map.structures.get_component(tile, edge)
+            if component is None or component in rewarded:
+                continue
 
-        for tile, edge in component:
-            assert tile.placed_pos is not None
-            if tile.get_external_tile(edge, tile.placed_pos, self.map._grid) is None:
-                return False
+            rewarded.add(component)
+            if not component.is_complete() or not component.meeples:
+                continue
 
-        return True
+            reward = component.get_reward()
+            for player_id in list(component.meeples):
+                self._apply_points(player_id, reward)
 
-    def check_any_complete(self, start_tile: "Tile") -> list[str]:
-        edges_complete: list[str] = []
-        for edge, tile in start_tile.get_external_tiles(self.map._grid).items():
-            if tile and self._check_completed_component(start_tile, edge):
-                edges_complete.append(edge)
-
-        return edges_complete
-
-    def _traverse_connected_component(
-        self,
-        start_tile: "Tile",
-        edge: str,
-        yield_cond: Callable[[Tile, str], bool] = lambda _1, _2: True,
-        modify: Callable[[Tile, str], None] = lambda _1, _2: None,
-    ) -> Iterator[tuple["Tile", str]]:
-        visited = set()
-
-        # Not a traversable edge - ie monastary etc
-        if edge not in start_tile.internal_edges.keys():
-            return
+            for meeples in list(component.meeples.values()):
+                for meeple in list(meeples):
+                    self._apply_free_meeple(meeple)
 
-        structure_type = start_tile.internal_edges[edge]
-        structure_bridge = TileModifier.get_bridge_modifier(structure_type)
+        x, y = pos
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                self._apply_monastary_reward(self.map._grid.get(x + dx, y + dy))
 
-        queue = deque([(start_tile, edge)])
+        return tile
 
-        while queue:
-            tile, edge = queue.popleft()
+    def apply_meeple(self, player_id: int, tile: "Tile", edge: str) -> None:
+        """
+        Apply Meeple
+        _Claims an edge (or the monastary) of a placed tile as a journaled move_
 
-            if (tile, edge) in visited:
-                continue
+        The player has to have a meeple left, see legal_meeple_moves for the edges.
+        """
+        undo = self._open_frame()
+
+        meeple = self._get_available_meeple(player_id)
+        assert meeple is not None
+
+        self._place_meeple(meeple, tile, edge)
+        self._add_meeples(player_id, -1)
+        undo.append((self._add_meeples, (player_id, 1)))
+        undo.append((meeple._free_meeple, ()))
+
+        if edge == MONASTARY_IDENTIFIER:
+            self._apply_monastary_reward(tile)
+
+        elif self._check_completed_component(tile, edge):
+            self._apply_points(player_id, self._get_reward(tile, edge))
+
+    def undo(self) -> None:
+        """
+        Takes back the last applied tile or meeple move
+        """
+        mark, undo = self.journal.pop()
+
+        for reverse, args in reversed(undo):
+            reverse(*args)
+
+        self.map.structures.rollback(mark)
+
+    def _open_frame(self) -> list[UndoEntry]:
+        frame: JournalFrame = (self.map.structures.mark(), [])
+        self.journal.append(frame)
+
+        return frame[1]
+
+    def _apply_points(self, player_id: int, points: int) -> None:
+        self._add_points(player_id, points)
+        self.journal[-1][1].append((self._add_points, (player_id, -points)))
+
+    def _apply_free_meeple(self, meeple: Meeple) -> None:
+        tile, edge = meeple.placed, meeple.placed_edge
+        assert tile is not None
+
+        self._free_meeple(meeple)
+        self._add_meeples(meeple.player_id, 1)
+
+        undo = self.journal[-1][1]
+        undo.append((meeple._place_meeple, (tile, edge)))
+        undo.append((self._add_meeples, (meeple.player_id, -1)))
+
+    def _apply_monastary_reward(self, tile: "Tile | None") -> None:
+        """
+        Scores a claimed monastary once all of its surrounding cells are filled
+        """
+        if tile is None or tile.placed_pos is None:
+            return
+
+        meeple = tile.internal_claims[MONASTARY_IDENTIFIER]
+        if meeple is None:
+            return
+
+        grid = self.map._grid
+        x, y = tile.placed_pos
+
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                if grid.is_empty(x + dx, y + dy):
+                    return
 
-            # Visiting portion of traversal
-            visited.add((tile, edge))
-            modify(tile, edge)
-
-            if yield_cond(tile, edge):
-                yield tile, edge
-
-            connected_internal_edges = [edge]
-
-            for adjacent_edge in Tile.adjacent_edges(edge):
-                if tile.internal_edges[adjacent_edge] == structure_type:
-                    if not (
-                        TileModifier.BROKEN_CITY in tile.modifiers
-                        and structure_type == StructureType.CITY
-                    ):
-                        connected_internal_edges.append(adjacent_edge)
-
-                        for adjacent_edge2 in Tile.adjacent_edges(adjacent_edge):
-                            if (
-                                tile.internal_edges[adjacent_edge]
-                                == tile.internal_edges[adjacent_edge2]
-                                and adjacent_edge2 not in connected_internal_edges
-                            ):
-                                connected_internal_edges.append(adjacent_edge2)
-
-            if (
-                len(connected_internal_edges) == 1
-                and structure_bridge
-                and structure_bridge in tile.modifiers
-            ):
-                if StructureType.is_compatible(
-                    structure_type, tile.internal_edges[Tile.get_opposite(edge)]
-                ):
-                    connected_internal_edges.append(Tile.get_opposite(edge))
-
-            if structure_type == StructureType.ROAD_START:
-                structure_type = StructureType.ROAD
-
-            for cid in connected_internal_edges:
-                assert tile.placed_pos is not None
-                neighbouring_tile = Tile.get_external_tile(
-                    cid, tile.placed_pos, self.map._grid
-                )
-
-                if neighbouring_tile:
-                    neighbouring_tile_edge = tile.get_opposite(cid)
-                    neighbouring_structure_type = neighbouring_tile.internal_edges[
-                        neighbouring_tile_edge
-                    ]
-
-                    if (
-                        structure_type == StructureType.ROAD
-                        and neighbouring_structure_type == StructureType.ROAD_START
-                    ):
-                        continue
-
-                    if (neighbouring_tile, neighbouring_tile_edge) not in visited:
-                        queue.append((neighbouring_tile, neighbouring_tile_edge))
+        self._apply_points(meeple.player_id, MONASTARY_POINTS)
+        self._apply_free_meeple(meeple)
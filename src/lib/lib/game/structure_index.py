@@ -0,0 +1,380 @@
+from lib.interact.edge import EDGE_ADJACENT, EDGE_OFFSETS, EDGE_OPPOSITE, EDGES, Edge
+from lib.interact.meeple import Meeple
+from lib.interact.structure import StructureType
+from lib.interact.tile import Tile, TileModifier
+
+from typing import Any, Callable, Sequence, TypeAlias, final
+
+INDEXED_STRUCTURES = {
+    StructureType.ROAD,
+    StructureType.ROAD_START,
+    StructureType.CITY,
+}
+
+NO_NODE = -1
+
+# Call restoring a single change, replayed in reverse to undo moves
+UndoEntry: TypeAlias = tuple[Callable[..., object], tuple[Any, ...]]
+
+
+@final
+class StructureComponent:
+    """
+    StructureComponent
+    _Aggregate of one connected road or city, only valid on the root node_
+    """
+
+    __slots__ = (
+        "structure_type",
+        "nodes",
+        "tiles",
+        "open_edges",
+        "meeples",
+        "emblems",
+        "scored",
+    )
+
+    def __init__(self, structure_type: StructureType, tile: Tile, edges: int) -> None:
+        self.structure_type = structure_type
+        self.nodes = edges
+        self.tiles: set[Tile] = {tile}
+        self.open_edges = edges
+        self.meeples: dict[int, list[Meeple]] = {}
+        self.emblems = int(StructureComponent._has_emblem(structure_type, tile))
+
+        # Completed while claimed, its meeples have been returned
+        self.scored = False
+
+    @staticmethod
+    def _has_emblem(structure_type: StructureType, tile: Tile) -> bool:
+        return (
+            structure_type == StructureType.CITY
+            and TileModifier.EMBLEM in tile.modifiers
+        )
+
+    def is_complete(self) -> bool:
+        return self.open_edges == 0
+
+    def get_reward(self, partial: bool = False) -> int:
+        points = (
+            StructureType.get_partial_points(self.structure_type)
+            if partial
+            else StructureType.get_points(self.structure_type)
+        )
+
+        # Emblem tiles are scored twice
+        return points * (len(self.tiles) + self.emblems)
+
+    def _absorb(self, other: "StructureComponent") -> None:
+        for tile in other.tiles:
+            if tile not in self.tiles:
+                self.tiles.add(tile)
+                self.emblems += StructureComponent._has_emblem(
+                    self.structure_type, tile
+                )
+
+        self.nodes += other.nodes
+        self.open_edges += other.open_edges
+
+        for player_id, meeples in other.meeples.items():
+            self.meeples.setdefault(player_id, []).extend(meeples)
+
+
+class StructureIndex:
+    """
+    StructureIndex
+    _Incremental disjoint set over (tile, edge) nodes of roads and cities_
+
+    Nodes are numbered tile slot * 4 + edge id, tile slots are given in placement order.
+    A road start edge terminates its road so it never joins the other edges of its tile.
+
+    Between mark and rollback every change is recorded on a trail, so moves tried by a
+    search can be taken back without copying the index.
+    """
+
+    def __init__(self) -> None:
+        self._slots: dict[tuple[int, int], int] = {}
+        self._tiles: list[Tile] = []
+        self._parent: list[int] = []
+        self._components: dict[int, StructureComponent] = {}
+        self._trail: list[UndoEntry] | None = None
+
+    def mark(self) -> int:
+        """
+        Starts recording changes if not already, returns the point to roll back to
+        """
+        if self._trail is None:
+            self._trail = []
+
+        return len(self._trail)
+
+    def rollback(self, mark: int) -> None:
+        """
+        Undoes every change since the mark, recording stops once back at the first mark
+        """
+        trail = self._trail
+        assert trail is not None
+
+        while len(trail) > mark:
+            undo, args = trail.pop()
+            undo(*args)
+
+        if mark == 0:
+            self._trail = None
+
+    def add_tile(self, tile: Tile, pos: tuple[int, int]) -> None:
+        slot = len(self._tiles)
+        self._tiles.append(tile)
+        self._slots[pos] = slot
+        self._parent.extend([NO_NODE] * 4)
+
+        if self._trail is not None:
+            self._trail.append((self._remove_slot, (pos,)))
+
+        edges = tile.internal_edges.by_id
+
+        for group in StructureIndex._get_edge_groups(tile, edges):
+            root = slot * 4 + group[0]
+            for edge in group:
+                self._parent[slot * 4 + edge] = root
+
+            structure_type = edges[group[0]]
+            if structure_type == StructureType.ROAD_START:
+                structure_type = StructureType.ROAD
+
+            self._components[root] = StructureComponent(
+                structure_type, tile, len(group)
+            )
+
+            if self._trail is not None:
+                self._trail.append((self._components.pop, (root,)))
+
+        x, y = pos
+        for edge in EDGES:
+            dx, dy = EDGE_OFFSETS[edge]
+            neighbour_slot = self._slots.get((x + dx, y + dy))
+            if neighbour_slot is None:
+                continue
+
+            node = slot * 4 + edge
+            neighbour_node = neighbour_slot * 4 + EDGE_OPPOSITE[edge]
+
+            # Both sides of a matched edge stop being open
+            for n in (node, neighbour_node):
+                if self._parent[n] != NO_NODE:
+                    component = self._components[self._find(n)]
+
+                    if self._trail is not None:
+                        self._trail.append(
+                            (setattr, (component, "open_edges", component.open_edges))
+                        )
+
+                    component.open_edges -= 1
+
+            if NO_NODE not in (self._parent[node], self._parent[neighbour_node]):
+                self._union(node, neighbour_node)
+
+    def get_component(self, tile: Tile, edge: Edge) -> StructureComponent | None:
+        node = self._get_node(tile, edge)
+        if node is None:
+            return None
+
+        return self._components[self._find(node)]
+
+    def claim(self, tile: Tile, edge: Edge, meeple: Meeple) -> None:
+        component = self.get_component(tile, edge)
+        if component is None:
+            return
+
+        component.meeples.setdefault(meeple.player_id, []).append(meeple)
+
+        if self._trail is not None:
+            self._trail.append((StructureIndex._unclaim, (component, meeple.player_id)))
+
+    def release(self, tile: Tile, edge: Edge, meeple: Meeple) -> None:
+        component = self.get_component(tile, edge)
+        if component is None:
+            return
+
+        meeples = component.meeples[meeple.player_id]
+
+        if self._trail is not None:
+            self._trail.append(
+                (
+                    StructureIndex._unrelease,
+                    (component, meeple, meeples.index(meeple), component.scored),
+                )
+            )
+
+        meeples.remove(meeple)
+
+        if component.is_complete():
+            component.scored = True
+
+        if not meeples:
+            del component.meeples[meeple.player_id]
+
+    def _get_node(self, tile: Tile, edge: Edge) -> int | None:
+        if tile.placed_pos is None:
+            return None
+
+        slot = self._slots.get(tile.placed_pos)
+        if slot is None or self._tiles[slot] is not tile:
+            return None
+
+        node = slot * 4 + edge
+        if self._parent[node] == NO_NODE:
+            return None
+
+        return node
+
+    def _find(self, node: int) -> int:
+        parent = self._parent
+        trail = self._trail
+
+        while parent[node] != node:
+            # Path halving
+            grandparent = parent[parent[node]]
+            if grandparent != parent[node]:
+                if trail is not None:
+                    trail.append((parent.__setitem__, (node, parent[node])))
+
+                parent[node] = grandparent
+
+            node = grandparent
+
+        return node
+
+    def _union(self, a: int, b: int) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+
+        component_a = self._components[root_a]
+        component_b = self._components[root_b]
+
+        if component_a.nodes < component_b.nodes:
+            root_a, root_b = root_b, root_a
+            component_a, component_b = component_b, component_a
+
+        if self._trail is not None:
+            self._trail.append(
+                (
+                    self._split,
+                    (
+                        root_a,
+                        root_b,
+                        component_b,
+                        component_b.tiles - component_a.tiles,
+                        (
+                            component_a.nodes,
+                            component_a.open_edges,
+                            component_a.emblems,
+                        ),
+                        {
+                            player_id: len(meeples)
+                            for player_id, meeples in component_a.meeples.items()
+                        },
+                    ),
+                )
+            )
+
+        self._parent[root_b] = root_a
+        component_a._absorb(component_b)
+        del self._components[root_b]
+
+    def _split(
+        self,
+        root_a: int,
+        root_b: int,
+        component_b: StructureComponent,
+        absorbed_tiles: set[Tile],
+        totals: tuple[int, int, int],
+        meeple_counts: dict[int, int],
+    ) -> None:
+        """
+        Undoes a union, component_b is left untouched by _absorb so it is put back as is
+        """
+        component_a = self._components[root_a]
+        component_a.tiles -= absorbed_tiles
+        component_a.nodes, component_a.open_edges, component_a.emblems = totals
+
+        for player_id in list(component_a.meeples):
+            if player_id in meeple_counts:
+                del component_a.meeples[player_id][meeple_counts[player_id] :]
+            else:
+                del component_a.meeples[player_id]
+
+        self._parent[root_b] = root_b
+        self._components[root_b] = component_b
+
+    def _remove_slot(self, pos: tuple[int, int]) -> None:
+        del self._slots[pos]
+        self._tiles.pop()
+        del self._parent[-4:]
+
+    @staticmethod
+    def _unclaim(component: StructureComponent, player_id: int) -> None:
+        meeples = component.meeples[player_id]
+        meeples.pop()
+
+        if not meeples:
+            del component.meeples[player_id]
+
+    @staticmethod
+    def _unrelease(
+        component: StructureComponent, meeple: Meeple, index: int, scored: bool
+    ) -> None:
+        component.meeples.setdefault(meeple.player_id, []).insert(index, meeple)
+        component.scored = scored
+
+    @staticmethod
+    def _get_edge_groups(
+        tile: Tile, edges: Sequence[StructureType]
+    ) -> list[list[Edge]]:
+        """
+        Groups the edges of a tile that are internally connected
+        """
+        groups: list[list[Edge]] = []
+        grouped = [False] * 4
+
+        for edge in EDGES:
+            structure_type = edges[edge]
+            if grouped[edge] or structure_type not in INDEXED_STRUCTURES:
+                continue
+
+            group = [edge]
+            grouped[edge] = True
+
+            if structure_type == StructureType.ROAD_START:
+                groups.append(group)
+                continue
+
+            adjacent = not (
+                structure_type == StructureType.CITY
+                and TileModifier.BROKEN_CITY in tile.modifiers
+            )
+            opposite = (
+                TileModifier.get_bridge_modifier(structure_type) in tile.modifiers
+            )
+
+            queue = [edge]
+            while queue:
+                current = queue.pop()
+
+                connecting: list[Edge] = []
+                if adjacent:
+                    connecting.extend(EDGE_ADJACENT[current])
+
+                if opposite:
+                    connecting.append(EDGE_OPPOSITE[current])
+
+                for other in connecting:
+                    if not grouped[other] and edges[other] == structure_type:
+                        grouped[other] = True
+                        group.append(other)
+                        queue.append(other)
+
+            groups.append(group)
+
+        return groups
@@ -0,0 +1,87 @@
+from lib.interact.tile import Tile
+
+from random import Random
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, final
+
+
+@final
+class TileBag:
+    """
+    TileBag
+    _Tiles left to draw, drawn at random in O(1) by swap remove_
+
+    Tiles of a type are interchangeable, so a draw picks a uniformly random slot for
+    its type then takes any tile of that type out of the bag. Tiles are kept in the
+    order they were added, so the same generator draws the same types.
+    """
+
+    __slots__ = ("_tiles", "_slots", "_by_type", "_counts")
+
+    def __init__(self, tiles: Iterable[Tile] = ()) -> None:
+        self._tiles: list[Tile] = []
+        self._slots: dict[Tile, int] = {}
+        self._by_type: dict[str, list[Tile]] = {}
+        self._counts: dict[str, int] = {}
+
+        self.extend(tiles)
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def __iter__(self) -> Iterator[Tile]:
+        return iter(self._tiles)
+
+    @property
+    def counts(self) -> Mapping[str, int]:
+        """
+        Tiles left by type, read only
+        """
+        return MappingProxyType(self._counts)
+
+    def extend(self, tiles: Iterable[Tile]) -> None:
+        for tile in tiles:
+            self._slots[tile] = len(self._tiles)
+            self._tiles.append(tile)
+            self._by_type.setdefault(tile.tile_type, []).append(tile)
+            self._counts[tile.tile_type] = self._counts.get(tile.tile_type, 0) + 1
+
+    def draw(self, rng: Random, count: int = 1) -> list[Tile]:
+        """
+        Removes count tiles at random, as random.sample would
+        """
+        if count > len(self._tiles):
+            raise ValueError("Sample larger than the tiles left in the bag.")
+
+        return [
+            self.take(self._tiles[rng.randrange(len(self._tiles))].tile_type)
+            for _ in range(count)
+        ]
+
+    def take(self, tile_type: str) -> Tile:
+        """
+        Removes a tile of the given type
+        """
+        tile = self._by_type[tile_type].pop()
+        self._counts[tile_type] -= 1
+
+        # Move the last tile into the freed slot
+        slot = self._slots.pop(tile)
+        last = self._tiles.pop()
+        if last is not tile:
+            self._tiles[slot] = last
+            self._slots[last] = slot
+
+        return tile
+
+    def peek(self, tile_type: str) -> Tile:
+        return self._by_type[tile_type][-1]
+
+    def get_probability(self, tile_type: str) -> float:
+        """
+        Chance the next tile drawn is of the given type
+        """
+        if not self._tiles:
+            return 0.0
+
+        return self._counts.get(tile_type, 0) / len(self._tiles)
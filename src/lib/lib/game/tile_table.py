@@ -0,0 +1,133 @@
+"""
+Tile Table
+_Static edge signatures of every tile type and rotation, built once on import_
+
+An edge signature packs the compatibility class of each edge into 2 bits, edge id e
+in bits 2e..2e+1. A constraint packs a mask of the constrained bits above a value,
+mask << 8 | value, and a signature fits it when signature & mask == value.
+
+There are 5 ** 4 constraints, the (type, rotations) fitting each are listed once on
+first lookup so open cells of the map can be matched against tiles with a dict get.
+"""
+
+from lib.interact.edge import EDGES, Edge
+from lib.interact.structure import StructureType
+from lib.interact.tile import Tile, create_base_tiles, create_river_tiles
+
+from typing import Mapping, Sequence
+
+# Structures that may sit next to each other share a class, as per is_compatible
+STRUCTURE_CLASSES: dict[StructureType, int] = {
+    StructureType.RIVER: 0,
+    StructureType.ROAD: 1,
+    StructureType.ROAD_START: 1,
+    StructureType.CITY: 2,
+    StructureType.GRASS: 3,
+}
+
+EDGE_BITS = 2
+CONSTRAINT_SHIFT = EDGE_BITS * 4
+SIGNATURE_MASK = (1 << CONSTRAINT_SHIFT) - 1
+NO_CONSTRAINT = 0
+
+# SIDE_CONSTRAINTS[edge id][structure class] is the constraint a neighbour exposing
+# that class puts on the given edge of the cell
+SIDE_CONSTRAINTS: list[list[int]] = [
+    [
+        (3 << (EDGE_BITS * edge)) << CONSTRAINT_SHIFT
+        | structure_class << (EDGE_BITS * edge)
+        for structure_class in range(4)
+    ]
+    for edge in EDGES
+]
+
+
+def pack_signature(edges: Sequence[StructureType]) -> int:
+    """
+    Packs structures given by edge id into an edge signature
+    """
+    signature = 0
+    for edge in EDGES:
+        signature |= STRUCTURE_CLASSES[edges[edge]] << (EDGE_BITS * edge)
+
+    return signature
+
+
+def _build_signatures() -> dict[str, tuple[int, int, int, int]]:
+    signatures: dict[str, tuple[int, int, int, int]] = {}
+
+    for tile in [
+        Tile.get_starting_tile(),
+        *create_river_tiles(),
+        Tile.get_river_end_tile(),
+        *create_base_tiles(),
+    ]:
+        if tile.tile_type in signatures:
+            continue
+
+        signatures[tile.tile_type] = (
+            pack_signature(tile.type.get_edges(0).by_id),
+            pack_signature(tile.type.get_edges(1).by_id),
+            pack_signature(tile.type.get_edges(2).by_id),
+            pack_signature(tile.type.get_edges(3).by_id),
+        )
+
+    return signatures
+
+
+TILE_SIGNATURES = _build_signatures()
+
+
+def _build_counts() -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for tile in [
+        *create_river_tiles(),
+        Tile.get_river_end_tile(),
+        *create_base_tiles(),
+    ]:
+        counts[tile.tile_type] = counts.get(tile.tile_type, 0) + 1
+
+    return counts
+
+
+# Copies of each tile type placed over a game after the starting tile. The river end
+# is placed by the engine and is the only tile that fits the end of the river
+TILE_COUNTS = _build_counts()
+
+
+def get_signature(tile: Tile) -> int:
+    return TILE_SIGNATURES[tile.tile_type][tile.rotation]
+
+
+def add_side_constraint(constraint: int, edge: Edge, structure: StructureType) -> int:
+    return constraint | SIDE_CONSTRAINTS[edge][STRUCTURE_CLASSES[structure]]
+
+
+def fits(signature: int, constraint: int) -> bool:
+    return signature & (constraint >> CONSTRAINT_SHIFT) == constraint & SIGNATURE_MASK
+
+
+# Tile types fitting a constraint, with the rotations they fit in
+_fitting: dict[int, Mapping[str, tuple[int, ...]]] = {}
+
+
+def get_fitting(constraint: int) -> Mapping[str, tuple[int, ...]]:
+    """
+    Tile types with at least one rotation fitting the constraint, mapped to those
+    rotations. The mapping is shared, callers must not change it
+    """
+    fitting = _fitting.get(constraint)
+    if fitting is None:
+        fitting = _fitting[constraint] = {
+            tile_type: rotations
+            for tile_type, signatures in TILE_SIGNATURES.items()
+            if (
+                rotations := tuple(
+                    rotation
+                    for rotation, signature in enumerate(signatures)
+                    if fits(signature, constraint)
+                )
+            )
+        }
+
+    return fitting
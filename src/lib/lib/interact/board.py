@@ -0,0 +1,130 @@
+from lib.config.map_config import MAX_MAP_LENGTH, TILE_TYPE_IDS, TILE_TYPES
+
+from array import array
+from collections.abc import Sequence
+from copy import deepcopy
+from typing import TYPE_CHECKING, Iterator, TypeAlias, final, overload
+
+if TYPE_CHECKING:
+    from lib.interact.tile import Tile
+
+
+EMPTY_CELL = 0
+
+# Boards and plain nested lists are both indexed as grid[y][x]
+GridType: TypeAlias = Sequence[Sequence["Tile | None"]]
+
+
+@final
+class BoardRow(Sequence["Tile | None"]):
+    """
+    BoardRow
+    _Read only row view of a board so cells can still be read as grid[y][x]_
+
+    Tiles are placed through Map.place_tile, which keeps the frontier and structures
+    in step with the board.
+    """
+
+    __slots__ = ("_tiles", "_offset")
+
+    def __init__(self, board: "Board", y: int) -> None:
+        self._tiles = board._tiles
+        self._offset = y * MAX_MAP_LENGTH
+
+    def _get_index(self, x: int) -> int:
+        if x < 0:
+            x += MAX_MAP_LENGTH
+
+        if not 0 <= x < MAX_MAP_LENGTH:
+            raise IndexError("board column out of range")
+
+        return self._offset + x
+
+    @overload
+    def __getitem__(self, x: int) -> "Tile | None": ...
+
+    @overload
+    def __getitem__(self, x: slice) -> list["Tile | None"]: ...
+
+    def __getitem__(self, x: int | slice) -> "Tile | None | list[Tile | None]":
+        # Fast path for the bounded reads bots do on every cell
+        if type(x) is int and 0 <= x < MAX_MAP_LENGTH:
+            return self._tiles.get(self._offset + x)
+
+        if isinstance(x, slice):
+            return [self[i] for i in range(*x.indices(MAX_MAP_LENGTH))]
+
+        return self._tiles.get(self._get_index(x))
+
+    def __setitem__(self, x: int, tile: "Tile | None") -> None:
+        raise TypeError("Board rows are read only, place tiles through the map.")
+
+    def __len__(self) -> int:
+        return MAX_MAP_LENGTH
+
+    def __iter__(self) -> Iterator["Tile | None"]:
+        for i in range(self._offset, self._offset + MAX_MAP_LENGTH):
+            yield self._tiles.get(i)
+
+
+@final
+class Board(list[BoardRow]):
+    """
+    Board
+    _Flat array of cell codes backing the map, (tile type id + 1) << 2 | rotation_
+
+    An empty cell is 0 and tile objects are only kept for occupied cells. Lookups in
+    the engine go through get, get_code and is_empty, the board is also the list of
+    its row views so bots can keep reading grid[y][x].
+    """
+
+    __slots__ = ("_codes", "_tiles")
+
+    def __init__(self) -> None:
+        self._codes = array("H", bytes(2 * MAX_MAP_LENGTH * MAX_MAP_LENGTH))
+        self._tiles: dict[int, "Tile"] = {}
+        super().__init__(BoardRow(self, y) for y in range(MAX_MAP_LENGTH))
+
+    @staticmethod
+    def encode(tile: "Tile") -> int:
+        return (TILE_TYPE_IDS[tile.tile_type] + 1) << 2 | tile.rotation
+
+    @staticmethod
+    def decode(code: int) -> tuple[str, int] | None:
+        """
+        Tile type and rotation of a cell code, None for an empty cell
+        """
+        if code == EMPTY_CELL:
+            return None
+
+        return TILE_TYPES[(code >> 2) - 1], code & 3
+
+    def get(self, x: int, y: int) -> "Tile | None":
+        return self._tiles.get(y * MAX_MAP_LENGTH + x)
+
+    def get_code(self, x: int, y: int) -> int:
+        return self._codes[y * MAX_MAP_LENGTH + x]
+
+    def is_empty(self, x: int, y: int) -> bool:
+        return self._codes[y * MAX_MAP_LENGTH + x] == EMPTY_CELL
+
+    def set(self, x: int, y: int, tile: "Tile | None") -> None:
+        i = y * MAX_MAP_LENGTH + x
+        if tile is None:
+            self._codes[i] = EMPTY_CELL
+            self._tiles.pop(i, None)
+            return
+
+        self._codes[i] = Board.encode(tile)
+        self._tiles[i] = tile
+
+    def __deepcopy__(self, memo: dict[int, object]) -> "Board":
+        board = Board()
+        memo[id(self)] = board
+
+        board._codes = array("H", self._codes)
+        board._tiles.update(
+            (i, deepcopy(tile, memo)) for i, tile in self._tiles.items()
+        )
+
+        return board
@@ -0,0 +1,47 @@
+from enum import IntEnum
+
+
+class Edge(IntEnum):
+    """
+    Edge
+    _Edge ids of a tile clockwise from the top, edge names are only used on the wire_
+    """
+
+    TOP_EDGE = 0
+    RIGHT_EDGE = 1
+    BOTTOM_EDGE = 2
+    LEFT_EDGE = 3
+
+    @staticmethod
+    def from_name(edge: str) -> "Edge":
+        return EDGE_IDS[edge]
+
+    @property
+    def edge_name(self) -> str:
+        return EDGE_NAMES[self]
+
+    @property
+    def opposite(self) -> "Edge":
+        return EDGE_OPPOSITE[self]
+
+    @property
+    def adjacent(self) -> tuple["Edge", "Edge"]:
+        return EDGE_ADJACENT[self]
+
+    @property
+    def offset(self) -> tuple[int, int]:
+        return EDGE_OFFSETS[self]
+
+
+EDGES: tuple[Edge, ...] = tuple(Edge)
+
+EDGE_NAMES: tuple[str, ...] = tuple(edge.name.lower() for edge in EDGES)
+EDGE_IDS: dict[str, Edge] = {edge.name.lower(): edge for edge in EDGES}
+
+EDGE_OPPOSITE: tuple[Edge, ...] = tuple(Edge((edge + 2) % 4) for edge in EDGES)
+EDGE_ADJACENT: tuple[tuple[Edge, Edge], ...] = tuple(
+    (Edge((edge - 1) % 4), Edge((edge + 1) % 4)) for edge in EDGES
+)
+
+# Position change (dx, dy) to the neighbouring cell across each edge
+EDGE_OFFSETS: tuple[tuple[int, int], ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from lib.interact.tile import (
     Tile,
     create_base_tiles,
@@ -6,56 +5,199 @@ from lib.interact.tile import (
     # create_expansion_tiles,
 )
 
+from lib.interact.board import Board
+from lib.interact.edge import EDGE_OFFSETS, EDGE_OPPOSITE, EDGES
+from lib.game.structure_index import StructureComponent, StructureIndex
+from lib.game.tile_bag import TileBag
+from lib.game.tile_table import (
+    NO_CONSTRAINT,
+    TILE_COUNTS,
+    add_side_constraint,
+    fits,
+    get_fitting,
+    get_signature,
+)
+
 from lib.config.map_config import MAX_MAP_LENGTH
 
+from typing import AbstractSet, Iterable, Mapping
+
 
 class Map:
     def __init__(self) -> None:
         self.placed_tiles: list[Tile] = []
-        self.available_tiles: set[Tile] = set()
-        self.available_tiles_by_type: dict[str, list[Tile]] = defaultdict(list)
+        self.available_tiles = TileBag()
+
+        self._grid = Board()
+        self.structures = StructureIndex()
+
+        # Empty cells next to a placed tile, with the packed edge constraint
+        # their neighbours put on them (see lib.game.tile_table)
+        self.frontier: dict[tuple[int, int], int] = {}
 
-        self._grid: list[list[Tile | None]] = [
-            [None for _ in range(MAX_MAP_LENGTH)] for _ in range(MAX_MAP_LENGTH)
-        ]
+        # Tiles of each type not on the map yet, whether left to draw or in a hand,
+        # and the frontier cells none of them fits. Dead cells stay empty for the
+        # rest of the game, as they only ever get more constrained
+        self.unplaced: dict[str, int] = dict(TILE_COUNTS)
+        self.dead_cells: set[tuple[int, int]] = set()
+
+        # Roads and cities with an open edge on a dead cell, found again once the
+        # map has changed, see get_unfinishable_components
+        self._unfinishable: set[StructureComponent] | None = None
 
     def start_base_phase(self) -> None:
         assert not self.available_tiles
-        self.available_tiles.update(set(create_base_tiles()))
-
-        for tile in self.available_tiles:
-            self.available_tiles_by_type[tile.tile_type].append(tile)
+        self.available_tiles.extend(create_base_tiles())
 
     def start_river_phase(self) -> None:
         assert not self.available_tiles
-
-        self.available_tiles.update(set(create_river_tiles()))
-
-        for tile in self.available_tiles:
-            self.available_tiles_by_type[tile.tile_type].append(tile)
+        self.available_tiles.extend(create_river_tiles())
+
+    def place_tile(self, tile: Tile, pos: tuple[int, int]) -> None:
+        """
+        Places an already rotated tile, all placements go through here to keep
+        the structure index in sync with the grid
+        """
+        tile.placed_pos = pos
+        self._unfinishable = None
+
+        self._grid.set(pos[0], pos[1], tile)
+        self.placed_tiles.append(tile)
+        self.structures.add_tile(tile, pos)
+
+        if tile.tile_type in self.unplaced:
+            self.unplaced[tile.tile_type] -= 1
+
+            # The last tile of its type no longer fills anything
+            if not self.unplaced[tile.tile_type]:
+                self._update_dead_cells(self.frontier.keys() - {pos})
+
+        self._update_frontier(tile, pos)
+
+    def remove_tile(
+        self, tile: Tile, frontier: list[tuple[tuple[int, int], int | None]]
+    ) -> None:
+        """
+        Takes back the last placed tile, given the frontier cells saved before it
+        was placed (see get_frontier_around). The structure index is rolled back
+        separately
+        """
+        assert self.placed_tiles[-1] is tile and tile.placed_pos is not None
+
+        self._unfinishable = None
+
+        x, y = tile.placed_pos
+        self._grid.set(x, y, None)
+        self.placed_tiles.pop()
+
+        for cell, constraint in frontier:
+            if constraint is None:
+                self.frontier.pop(cell, None)
+                self.dead_cells.discard(cell)
+            else:
+                self.frontier[cell] = constraint
+
+        if tile.tile_type in self.unplaced:
+            self.unplaced[tile.tile_type] += 1
+
+            if self.unplaced[tile.tile_type] == 1:
+                self._update_dead_cells(self.frontier)
+                return
+
+        self._update_dead_cells(
+            cell for cell, constraint in frontier if constraint is not None
+        )
+
+    def get_frontier_around(
+        self, pos: tuple[int, int]
+    ) -> list[tuple[tuple[int, int], int | None]]:
+        """
+        Frontier entries a placement at pos can change, None for cells not on it
+        """
+        x, y = pos
+        cells = [pos, *((x + dx, y + dy) for dx, dy in EDGE_OFFSETS)]
+
+        return [(cell, self.frontier.get(cell)) for cell in cells]
+
+    def _update_frontier(self, tile: Tile, pos: tuple[int, int]) -> None:
+        self.frontier.pop(pos, None)
+        self.dead_cells.discard(pos)
+
+        x, y = pos
+        for edge in EDGES:
+            dx, dy = EDGE_OFFSETS[edge]
+            nx, ny = x + dx, y + dy
+
+            if not (0 <= nx < MAX_MAP_LENGTH and 0 <= ny < MAX_MAP_LENGTH):
+                continue
+
+            if not self._grid.is_empty(nx, ny):
+                continue
+
+            self.frontier[(nx, ny)] = add_side_constraint(
+                self.frontier.get((nx, ny), NO_CONSTRAINT),
+                EDGE_OPPOSITE[edge],
+                tile.internal_edges.by_id[edge],
+            )
+            self._update_dead_cells(((nx, ny),))
+
+    def _update_dead_cells(self, cells: Iterable[tuple[int, int]]) -> None:
+        for cell in cells:
+            if any(self.unplaced.get(t) for t in get_fitting(self.frontier[cell])):
+                self.dead_cells.discard(cell)
+            else:
+                self.dead_cells.add(cell)
+
+    def get_unfinishable_components(self) -> AbstractSet[StructureComponent]:
+        """
+        Roads and cities with an open edge on a dead cell, they can never complete
+        """
+        if self._unfinishable is None:
+            self._unfinishable = set()
+
+            for x, y in self.dead_cells:
+                for edge in EDGES:
+                    dx, dy = EDGE_OFFSETS[edge]
+                    tile = self._grid.get(x + dx, y + dy)
+                    if tile is None:
+                        continue
+
+                    component = self.structures.get_component(tile, EDGE_OPPOSITE[edge])
+                    if component is not None:
+                        self._unfinishable.add(component)
+
+        return self._unfinishable
+
+    def get_fitting(self, pos: tuple[int, int]) -> Mapping[str, tuple[int, ...]]:
+        """
+        Tile types whose edges fit the open cell, with the rotations they fit in
+        """
+        return get_fitting(self.frontier[pos])
+
+    def can_fit(self, tile: Tile, pos: tuple[int, int]) -> bool:
+        """
+        Tile fits at a frontier cell in its current rotation, by edges only
+        """
+        constraint = self.frontier.get(pos)
+        if constraint is None:
+            return False
+
+        return fits(get_signature(tile), constraint)
 
     def place_river_start(self, pos: tuple[int, int]) -> None:
-        starting_tile = Tile.get_starting_tile()
-        starting_tile.placed_pos = pos
-
-        self._grid[pos[1]][pos[0]] = starting_tile
-        self.placed_tiles.append(starting_tile)
+        self.place_tile(Tile.get_starting_tile(), pos)
 
     def place_river_end(self, pos: tuple[int, int], rotation: int) -> None:
         river_end_tile = Tile.get_river_end_tile()
         river_end_tile.rotate_clockwise(rotation)
-        river_end_tile.placed_pos = pos
 
-        self._grid[pos[1]][pos[0]] = river_end_tile
-        self.placed_tiles.append(river_end_tile)
+        self.place_tile(river_end_tile, pos)
 
     def add_expansion_pack(self, expansion_pack: None) -> None:
         pass
 
     def get_tile_by_type(self, type: str, pop: bool) -> "Tile":
         if pop:
-            tile = self.available_tiles_by_type[type].pop()
-            self.available_tiles.remove(tile)
-            return tile
+            return self.available_tiles.take(type)
 
-        return self.available_tiles_by_type[type][0]
+        return self.available_tiles.peek(type)
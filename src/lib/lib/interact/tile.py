@@ -1,14 +1,22 @@
-from lib.config.map_config import MONASTARY_IDENTIFIER, tile_counts
+from lib.config.map_config import tile_counts
 from lib.config.scoring import NO_POINTS
 from lib.interact.structure import StructureType
 from lib.interact.meeple import Meeple
+from lib.interact.tile_edges import EDGE_KEYS, TileClaims, TileEdges
+from lib.interact.edge import (
+    EDGE_ADJACENT,
+    EDGE_IDS,
+    EDGE_NAMES,
+    EDGE_OFFSETS,
+    EDGE_OPPOSITE,
+    Edge,
+)
+from lib.interact.board import GridType
 
 from enum import Enum, auto
-from copy import deepcopy
 from collections import namedtuple
-from dotmap import DotMap
 
-from typing import Callable, final, Self
+from typing import Callable, ClassVar, final
 
 from lib.models.tile_model import TileModel
 
@@ -52,71 +60,115 @@ class TileModifier(Enum):
         return points
 
 
+@final
+class TileType:
+    """
+    TileType
+    Desc: _Shared definition of a tile type, a flyweight every tile of the type refers to_
+
+    Types are interned by definition and never mutated. Copying returns the same type.
+    """
+
+    __slots__ = ("name", "modifiers", "_rotated_edges")
+
+    _types: ClassVar[dict[tuple[object, ...], "TileType"]] = {}
+
+    @staticmethod
+    def define(
+        name: str,
+        left_edge: StructureType,
+        right_edge: StructureType,
+        top_edge: StructureType,
+        bottom_edge: StructureType,
+        modifiers: list[TileModifier] | None = None,
+    ) -> "TileType":
+        key = (name, left_edge, right_edge, top_edge, bottom_edge, *(modifiers or []))
+
+        tile_type = TileType._types.get(key)
+        if tile_type is None:
+            tile_type = TileType._types[key] = TileType(
+                name, [top_edge, right_edge, bottom_edge, left_edge], modifiers or []
+            )
+
+        return tile_type
+
+    def __init__(
+        self, name: str, edges: list[StructureType], modifiers: list[TileModifier]
+    ) -> None:
+        """
+        Edges are given clockwise from the top edge
+        """
+        self.name = name
+        self.modifiers = modifiers
+
+        # Rotating clockwise moves the structure on edge i - 1 onto edge i
+        self._rotated_edges = tuple(
+            TileEdges(tuple(edges[(i - rotation) % 4] for i in range(4)))
+            for rotation in range(4)
+        )
+
+    def get_edges(self, rotation: int) -> TileEdges:
+        return self._rotated_edges[rotation]
+
+    def __copy__(self) -> "TileType":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, object]) -> "TileType":
+        return self
+
+
 class Tile:
     """
     Tile
     Desc: _Stores all Tile Info by internal edges (Structures) and external connections_
+
+    Edges and modifiers are read from the shared TileType, a tile only owns its rotation,
+    position and claims.
     """
 
+    __slots__ = ("type", "internal_claims", "rotation", "placed_pos")
+
     EdgeTuple = namedtuple(
         "EdgeTuple", ["left_edge", "right_edge", "top_edge", "bottom_edge"]
     )
 
-    starting_tile: "Tile | None" = None
-    river_end_tile: "Tile | None" = None
-
     @final
     @staticmethod
     def get_opposite(edge: str) -> str:
-        return {
-            "left_edge": "right_edge",
-            "right_edge": "left_edge",
-            "top_edge": "bottom_edge",
-            "bottom_edge": "top_edge",
-        }[edge]
+        return EDGE_NAMES[EDGE_OPPOSITE[EDGE_IDS[edge]]]
 
     @final
     @staticmethod
     def adjacent_edges(edge: str) -> list[str]:
-        return {
-            "left_edge": ["top_edge", "bottom_edge"],
-            "right_edge": ["top_edge", "bottom_edge"],
-            "top_edge": ["left_edge", "right_edge"],
-            "bottom_edge": ["left_edge", "right_edge"],
-        }[edge]
+        adjacent = EDGE_ADJACENT[EDGE_IDS[edge]]
+        return [name for name in EDGE_KEYS if EDGE_IDS[name] in adjacent]
 
     @final
     @staticmethod
     def get_edges() -> list[str]:
-        return ["left_edge", "right_edge", "top_edge", "bottom_edge"]
+        return list(EDGE_KEYS)
 
     @final
     @staticmethod
     def get_external_tile(
-        edge: str, pos: tuple[int, int], grid: list[list["Tile | None"]]
+        edge: str, pos: tuple[int, int], grid: GridType
     ) -> "Tile | None":
-        match edge:
-            case "left_edge":
-                return grid[pos[1]][pos[0] - 1]
-            case "right_edge":
-                return grid[pos[1]][pos[0] + 1]
-            case "top_edge":
-                return grid[pos[1] - 1][pos[0]]
-            case "bottom_edge":
-                return grid[pos[1] + 1][pos[0]]
-
-        assert False
+        return Tile.get_neighbour(EDGE_IDS[edge], pos, grid)
 
     @final
-    def get_external_tiles(
-        self, grid: list[list["Tile | None"]]
-    ) -> dict[str, "Tile | None"]:
+    @staticmethod
+    def get_neighbour(
+        edge: Edge, pos: tuple[int, int], grid: GridType
+    ) -> "Tile | None":
+        dx, dy = EDGE_OFFSETS[edge]
+        return grid[pos[1] + dy][pos[0] + dx]
+
+    @final
+    def get_external_tiles(self, grid: GridType) -> dict[str, "Tile | None"]:
         tiles: dict[str, "Tile | None"] = {}
         for edge in self.internal_edges:
             if self.placed_pos:
-                tiles[edge] = self.__class__.get_external_tile(
-                    edge, self.placed_pos, grid
-                )
+                tiles[edge] = Tile.get_external_tile(edge, self.placed_pos, grid)
 
             else:
                 tiles[edge] = None
@@ -125,29 +177,25 @@ class Tile:
 
     @staticmethod
     def get_starting_tile() -> "Tile":
-        if not Tile.starting_tile:
-            Tile.starting_tile = Tile(
-                tile_id="RS",
-                left_edge=StructureType.GRASS,
-                right_edge=StructureType.GRASS,
-                top_edge=StructureType.RIVER,
-                bottom_edge=StructureType.GRASS,
-                modifiers=[TileModifier.RIVER],
-            )
-        return Tile.starting_tile
+        return Tile(
+            tile_id="RS",
+            left_edge=StructureType.GRASS,
+            right_edge=StructureType.GRASS,
+            top_edge=StructureType.RIVER,
+            bottom_edge=StructureType.GRASS,
+            modifiers=[TileModifier.RIVER],
+        )
 
     @staticmethod
     def get_river_end_tile() -> "Tile":
-        if not Tile.river_end_tile:
-            Tile.river_end_tile = Tile(
-                tile_id="RE",
-                left_edge=StructureType.GRASS,
-                right_edge=StructureType.GRASS,
-                top_edge=StructureType.GRASS,
-                bottom_edge=StructureType.RIVER,
-                modifiers=[TileModifier.RIVER],
-            )
-        return Tile.river_end_tile
+        return Tile(
+            tile_id="RE",
+            left_edge=StructureType.GRASS,
+            right_edge=StructureType.GRASS,
+            top_edge=StructureType.GRASS,
+            bottom_edge=StructureType.RIVER,
+            modifiers=[TileModifier.RIVER],
+        )
 
     def __init__(
         self,
@@ -158,56 +206,53 @@ class Tile:
         bottom_edge: StructureType,
         modifiers: list[TileModifier] = list(),
     ) -> None:
-        self.internal_edges = DotMap(
-            Tile.EdgeTuple(
-                left_edge=left_edge,
-                right_edge=right_edge,
-                top_edge=top_edge,
-                bottom_edge=bottom_edge,
-            )._asdict(),
-            _dynamic=False,
+        self._init(
+            TileType.define(
+                tile_id, left_edge, right_edge, top_edge, bottom_edge, modifiers
+            )
         )
 
-        self.internal_claims: dict[str, "Meeple | None"] = DotMap(
-            Tile.EdgeTuple(
-                left_edge=None,
-                right_edge=None,
-                top_edge=None,
-                bottom_edge=None,
-            )._asdict(),
-            _dynamic=False,
-        )
+    @staticmethod
+    def from_type(tile_type: TileType) -> "Tile":
+        tile = Tile.__new__(Tile)
+        tile._init(tile_type)
+        return tile
 
-        self.internal_claims[MONASTARY_IDENTIFIER] = None
+    def _init(self, tile_type: TileType) -> None:
+        self.type = tile_type
 
+        self.internal_claims = TileClaims()
         self.rotation = 0
-        self.modifiers = modifiers if modifiers else []
-        self.tile_type = tile_id
         self.placed_pos: tuple[int, int] | None = None
 
-    def rotate_clockwise(self, number: int) -> None:
-        for _ in range(number):
-            (
-                self.internal_edges.right_edge,
-                self.internal_edges.bottom_edge,
-                self.internal_edges.left_edge,
-                self.internal_edges.top_edge,
-            ) = (
-                self.internal_edges.top_edge,
-                self.internal_edges.right_edge,
-                self.internal_edges.bottom_edge,
-                self.internal_edges.left_edge,
-            )
+    @property
+    def internal_edges(self) -> TileEdges:
+        """
+        Read only, shared by every tile of the type with the same rotation
+        """
+        return self.type.get_edges(self.rotation)
+
+    @property
+    def modifiers(self) -> list[TileModifier]:
+        return self.type.modifiers
 
+    @property
+    def tile_type(self) -> str:
+        return self.type.name
+
+    def rotate_clockwise(self, number: int) -> None:
         self.rotation += number
         self.rotation %= 4
 
+    def rotate_to(self, rotation: int) -> None:
+        self.rotation = rotation % 4
+
     def _claim_edge(self, meeple: Meeple, edge: str) -> None:
         self.internal_claims[edge] = meeple
 
     @final
-    def clone_add(self, n: int) -> list[Self]:
-        cloned_tiles = [deepcopy(self) for _ in range(n - 1)]
+    def clone_add(self, n: int) -> list["Tile"]:
+        cloned_tiles = [Tile.from_type(self.type) for _ in range(n - 1)]
         cloned_tiles.append(self)
         return cloned_tiles
 
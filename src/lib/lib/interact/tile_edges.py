@@ -0,0 +1,139 @@
+from lib.config.map_config import MONASTARY_IDENTIFIER
+from lib.interact.edge import EDGE_IDS, Edge
+from lib.interact.structure import StructureType
+
+from typing import TYPE_CHECKING, Iterator, final
+
+if TYPE_CHECKING:
+    from lib.interact.meeple import Meeple
+
+
+# Name order the string keyed views iterate in, as tiles always have
+EDGE_KEYS = ["left_edge", "right_edge", "top_edge", "bottom_edge"]
+CLAIM_KEYS = [*EDGE_KEYS, MONASTARY_IDENTIFIER]
+
+CLAIM_IDS: dict[str, int] = {**EDGE_IDS, MONASTARY_IDENTIFIER: len(EDGE_IDS)}
+
+
+@final
+class TileEdges:
+    """
+    TileEdges
+    _Read only structures of a tile, stored by edge id_
+
+    Indexing by edge name (edges["left_edge"], edges.left_edge, items...) is kept as a
+    compatibility shim, internal code reads by_id directly.
+    """
+
+    __slots__ = ("by_id",)
+
+    def __init__(self, by_id: tuple[StructureType, ...]) -> None:
+        self.by_id = by_id
+
+    def __getitem__(self, edge: str) -> StructureType:
+        return self.by_id[EDGE_IDS[edge]]
+
+    def get(
+        self, edge: str, default: StructureType | None = None
+    ) -> StructureType | None:
+        edge_id = EDGE_IDS.get(edge)
+        return default if edge_id is None else self.by_id[edge_id]
+
+    def keys(self) -> list[str]:
+        return list(EDGE_KEYS)
+
+    def values(self) -> list[StructureType]:
+        return [self[edge] for edge in EDGE_KEYS]
+
+    def items(self) -> list[tuple[str, StructureType]]:
+        return [(edge, self[edge]) for edge in EDGE_KEYS]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(EDGE_KEYS)
+
+    def __len__(self) -> int:
+        return len(EDGE_KEYS)
+
+    def __contains__(self, edge: object) -> bool:
+        return edge in EDGE_IDS
+
+    @property
+    def top_edge(self) -> StructureType:
+        return self.by_id[Edge.TOP_EDGE]
+
+    @property
+    def right_edge(self) -> StructureType:
+        return self.by_id[Edge.RIGHT_EDGE]
+
+    @property
+    def bottom_edge(self) -> StructureType:
+        return self.by_id[Edge.BOTTOM_EDGE]
+
+    @property
+    def left_edge(self) -> StructureType:
+        return self.by_id[Edge.LEFT_EDGE]
+
+    def __repr__(self) -> str:
+        return f"TileEdges({dict(self.items())})"
+
+
+@final
+class TileClaims:
+    """
+    TileClaims
+    _Meeples on a tile, stored by edge id with the monastary last_
+
+    Indexing by edge name is kept as a compatibility shim, as for TileEdges.
+    """
+
+    __slots__ = ("by_id",)
+
+    def __init__(self) -> None:
+        self.by_id: list["Meeple | None"] = [None] * len(CLAIM_KEYS)
+
+    def __getitem__(self, edge: str) -> "Meeple | None":
+        return self.by_id[CLAIM_IDS[edge]]
+
+    def __setitem__(self, edge: str, meeple: "Meeple | None") -> None:
+        self.by_id[CLAIM_IDS[edge]] = meeple
+
+    def get(self, edge: str, default: "Meeple | None" = None) -> "Meeple | None":
+        claim_id = CLAIM_IDS.get(edge)
+        return default if claim_id is None else self.by_id[claim_id]
+
+    def keys(self) -> list[str]:
+        return list(CLAIM_KEYS)
+
+    def values(self) -> list["Meeple | None"]:
+        return [self[edge] for edge in CLAIM_KEYS]
+
+    def items(self) -> list[tuple[str, "Meeple | None"]]:
+        return [(edge, self[edge]) for edge in CLAIM_KEYS]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CLAIM_KEYS)
+
+    def __len__(self) -> int:
+        return len(CLAIM_KEYS)
+
+    def __contains__(self, edge: object) -> bool:
+        return edge in CLAIM_IDS
+
+    @property
+    def top_edge(self) -> "Meeple | None":
+        return self.by_id[Edge.TOP_EDGE]
+
+    @property
+    def right_edge(self) -> "Meeple | None":
+        return self.by_id[Edge.RIGHT_EDGE]
+
+    @property
+    def bottom_edge(self) -> "Meeple | None":
+        return self.by_id[Edge.BOTTOM_EDGE]
+
+    @property
+    def left_edge(self) -> "Meeple | None":
+        return self.by_id[Edge.LEFT_EDGE]
+
+    def __repr__(self) -> str:
+        return f"TileClaims({dict(self.items())})"
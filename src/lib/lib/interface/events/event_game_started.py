@@ -10,6 +10,9 @@ class EventGameStarted(BaseEvent):
     turn_order: list[int]
     players: Sequence[PlayerModel]
 
+    # Seed of the engine's draws, only in the recording as bots must not see it
+    seed: int | None = None
+
 
 class PublicEventGameStarted(BaseEvent):
     event_type: Literal["public_event_game_started"] = "public_event_game_started"
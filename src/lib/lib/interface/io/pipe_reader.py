@@ -0,0 +1,114 @@
+import os
+from math import floor, log10
+from typing import Callable, final
+
+
+class MalformedSizeError(ValueError):
+    pass
+
+
+@final
+class PipeReader:
+    """
+    PipeReader
+    _Reads length prefixed messages from a binary pipe into one preallocated buffer_
+
+    A message is its size in bytes, the delimiter, then the payload. Bytes of the
+    next message read along with the current one stay buffered for the next read.
+    If given, wait is called with the fd before every read of the pipe.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        max_size: int,
+        delim: bytes = b",",
+        wait: Callable[[int], None] | None = None,
+    ) -> None:
+        self.fd = fd
+        self.wait = wait
+        self.max_size = max_size
+        self.delim = delim[0]
+
+        # Longest size prefix accepted, delimiter included
+        self.max_prefix = floor(log10(max_size)) + 1
+
+        self._buffer = bytearray(self.max_prefix + max_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    def read_size(self) -> int:
+        """
+        Consumes the size prefix of the next message
+        """
+        scanned = 0
+        while True:
+            i = self._buffer.find(
+                self.delim,
+                self._start + scanned,
+                min(self._end, self._start + self.max_prefix),
+            )
+            if i >= 0:
+                break
+
+            scanned = self._end - self._start
+            if scanned >= self.max_prefix:
+                raise MalformedSizeError(bytes(self._view[self._start : self._end]))
+
+            self._fill()
+
+        digits = self._view[self._start : i]
+        self._start = i + 1
+
+        try:
+            size = int(bytes(digits))
+        except ValueError:
+            raise MalformedSizeError(bytes(digits))
+
+        if size < 0:
+            raise MalformedSizeError(bytes(digits))
+
+        return size
+
+    def read_payload(self, size: int) -> str:
+        """
+        Consumes a payload of the given size, after read_size
+        """
+        assert size <= self.max_size
+
+        while self._end - self._start < size:
+            self._fill()
+
+        payload = str(self._view[self._start : self._start + size], "utf-8")
+        self._start += size
+
+        return payload
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    def discard(self) -> None:
+        """
+        Drops any buffered bytes not read yet
+        """
+        self._start = self._end = 0
+
+    def _fill(self) -> None:
+        if self._start == self._end:
+            self._start = self._end = 0
+
+        elif self._end == len(self._buffer):
+            # Move the unread bytes to the front to make room
+            pending = self._end - self._start
+            self._buffer[:pending] = self._view[self._start : self._end]
+            self._start, self._end = 0, pending
+
+        if self.wait is not None:
+            self.wait(self.fd)
+
+        read = os.readv(self.fd, [self._view[self._end :]])
+        if read == 0:
+            raise EOFError("pipe closed by writer")
+
+        self._end += read
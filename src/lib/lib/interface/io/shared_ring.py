@@ -0,0 +1,217 @@
+import os
+import select
+import struct
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, final
+
+from lib.interface.io.pipe_reader import MalformedSizeError
+
+# Total bytes written and read, each only ever advanced by its own side
+HEADER = struct.Struct("=QQ")
+SIZE = struct.Struct("=I")
+
+# Byte written to the pipe once a message is in the ring, the pipe only signals
+DOORBELL = b"\x01"
+DOORBELL_READ_SIZE = 4096
+
+# Written to a player's io directory by the engine, names of the rings of its pipes
+RING_NAMES_FILE = "shared_memory.json"
+
+
+class RingFullError(ValueError):
+    pass
+
+
+@final
+class SharedRing:
+    """
+    SharedRing
+    _Single producer single consumer ring of size prefixed messages in shared memory_
+
+    The producer copies a message in and advances the write count, the consumer
+    copies it out and advances the read count. Both counts only grow, their
+    difference is the number of bytes waiting.
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool) -> None:
+        self.shm = shm
+        self.owner = owner
+        self.capacity = shm.size - HEADER.size
+
+        buffer = shm.buf
+        assert buffer is not None
+        self._view = buffer
+        self._data = buffer[HEADER.size :]
+
+    @staticmethod
+    def create(capacity: int) -> "SharedRing":
+        ring = SharedRing(
+            SharedMemory(create=True, size=HEADER.size + capacity), owner=True
+        )
+        HEADER.pack_into(ring._view, 0, 0, 0)
+
+        return ring
+
+    @staticmethod
+    def attach(name: str) -> "SharedRing":
+        """
+        Attaches to a ring created by another process, which stays its owner
+        """
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(name, track=False)
+        else:
+            shm = SharedMemory(name)
+            # Otherwise the tracker of this process unlinks the ring on exit
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+
+        return SharedRing(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def push(self, payload: bytes) -> None:
+        written, read = HEADER.unpack_from(self._view)
+
+        if SIZE.size + len(payload) > self.capacity - (written - read):
+            raise RingFullError(
+                f"message of {len(payload)} bytes does not fit in the ring"
+            )
+
+        position = self._copy_in(written, SIZE.pack(len(payload)))
+        position = self._copy_in(position, payload)
+
+        # Publish the message only once it is all in
+        struct.pack_into("=Q", self._view, 0, position)
+
+    def peek_size(self) -> int | None:
+        """
+        Size of the next message, None when the ring is empty
+        """
+        written, read = HEADER.unpack_from(self._view)
+        if written == read:
+            return None
+
+        return self._read_size(written, read)
+
+    def pop(self) -> bytes:
+        written, read = HEADER.unpack_from(self._view)
+        assert written != read
+
+        size = self._read_size(written, read)
+        payload = self._copy_out(read + SIZE.size, size)
+
+        struct.pack_into("=Q", self._view, 8, read + SIZE.size + size)
+        return payload
+
+    def clear(self) -> None:
+        """
+        Drops every waiting message, only the consumer may clear
+        """
+        written, _ = HEADER.unpack_from(self._view)
+        struct.pack_into("=Q", self._view, 8, written)
+
+    def close(self) -> None:
+        self._data.release()
+        self._view = None  # type: ignore[assignment]
+        self.shm.close()
+
+        if self.owner:
+            self.shm.unlink()
+
+    def _read_size(self, written: int, read: int) -> int:
+        # Written by the other process, it has to stay within the bytes waiting
+        (size,) = SIZE.unpack(self._copy_out(read, SIZE.size))
+        if written - read < SIZE.size or size > written - read - SIZE.size:
+            raise MalformedSizeError(size)
+
+        return int(size)
+
+    def _copy_in(self, position: int, data: bytes) -> int:
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+
+        self._data[start : start + first] = data[:first]
+        self._data[: len(data) - first] = data[first:]
+
+        return position + len(data)
+
+    def _copy_out(self, position: int, size: int) -> bytes:
+        start = position % self.capacity
+        first = min(size, self.capacity - start)
+
+        return bytes(self._data[start : start + first]) + bytes(
+            self._data[: size - first]
+        )
+
+
+@final
+class SharedRingReader:
+    """
+    SharedRingReader
+    _Reads messages from a shared ring, blocking on its doorbell pipe_
+
+    Has the interface of PipeReader so connections can use either transport. Every
+    message read takes one doorbell off the pipe, so the pipe is only readable while
+    a message is waiting.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        ring: SharedRing,
+        wait: Callable[[int], None] | None = None,
+    ) -> None:
+        self.fd = fd
+        self.ring = ring
+        self.wait = wait
+
+        # Doorbells read off the pipe for messages not popped yet
+        self._doorbells = 0
+
+    def read_size(self) -> int:
+        while True:
+            size = self.ring.peek_size()
+            if size is not None:
+                return size
+
+            self._read_doorbells(DOORBELL_READ_SIZE)
+
+    def read_payload(self, size: int) -> str:
+        payload = self.ring.pop()
+        if len(payload) != size:
+            raise MalformedSizeError(len(payload))
+
+        # The doorbell is rung after the message is in, it may not be read yet
+        while not self._doorbells:
+            self._read_doorbells(1)
+
+        self._doorbells -= 1
+        return payload.decode()
+
+    def discard(self) -> None:
+        """
+        Drops every waiting message and the doorbells already rung for them
+        """
+        self.ring.clear()
+        self._doorbells = 0
+
+        while select.select([self.fd], [], [], 0)[0]:
+            if not os.read(self.fd, DOORBELL_READ_SIZE):
+                break
+
+    def _read_doorbells(self, count: int) -> None:
+        if self.wait is not None:
+            self.wait(self.fd)
+
+        doorbells = os.read(self.fd, count)
+        if not doorbells:
+            raise EOFError("pipe closed by writer")
+
+        self._doorbells += len(doorbells)
+
+    def close(self) -> None:
+        os.close(self.fd)
+        self.ring.close()
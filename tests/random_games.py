@@ -0,0 +1,78 @@
+"""
+Random Games
+_Headless games between bots playing uniformly random legal moves_
+
+Each bot keeps its own helper ClientSate, tests inspect it through on_query, which
+is called with the bot's state before every move it makes.
+"""
+
+from engine.config.game_config import NUM_PLAYERS
+from engine.game_engine import GameEngine
+from engine.interface.io.game_result import GameResult
+from engine.interface.io.local_connection import Agent
+from helper.client_state import ClientSate
+from helper.game import Game
+
+from lib.interface.events.moves.typing import MoveType
+from lib.interface.queries.query_place_tile import QueryPlaceTile
+from lib.interface.queries.typing import QueryType
+from lib.models.tile_model import TileModel
+
+import contextlib
+import io
+from random import Random
+from typing import Callable
+
+
+def make_random_agent(
+    rng: Random, on_query: Callable[[ClientSate, QueryType], None]
+) -> Agent:
+    game = Game(connect=False)
+    placed: list[TileModel] = []
+
+    def agent(query: QueryType) -> MoveType:
+        game.update(query)
+        state = game.state
+        on_query(state, query)
+
+        if isinstance(query, QueryPlaceTile):
+            tile_index, pos, rotation = rng.choice(
+                list(state.legal_tile_moves(state.my_tiles))
+            )
+            tile = state.my_tiles[tile_index]
+            tile.rotate_to(rotation)
+
+            model = TileModel(tile_type=tile.tile_type, pos=pos, rotation=rotation)
+            placed.append(model)
+            return game.move_place_tile(query, model, tile_index)
+
+        model = placed.pop()
+        x, y = model.pos
+        tile = state.map._grid.get(x, y)
+        assert tile is not None
+
+        edges: list[str | None] = [None]
+        if state.players_meeples[state.me.player_id] > 0:
+            edges.extend(state.legal_meeple_moves(tile))
+
+        edge = rng.choice(edges)
+        if edge is None:
+            return game.move_place_meeple_pass(query)
+
+        return game.move_place_meeple(query, model, placed_on=edge)
+
+    return agent
+
+
+def play_random_game(
+    seed: int, on_query: Callable[[ClientSate, QueryType], None]
+) -> GameResult:
+    rng = Random(seed)
+    engine = GameEngine(
+        agents=[make_random_agent(rng, on_query) for _ in range(NUM_PLAYERS)],
+        seed=seed,
+    )
+
+    # The engine reports moves and scoring on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        return engine.start()
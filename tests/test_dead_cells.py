@@ -0,0 +1,57 @@
+from helper.client_state import ClientSate
+
+from lib.game.tile_table import TILE_COUNTS, get_fitting
+from lib.interface.queries.typing import QueryType
+
+from random_games import play_random_game
+
+from collections import Counter
+import unittest
+
+GAMES = 8
+
+
+def find_dead_cells(state: ClientSate) -> set[tuple[int, int]]:
+    """
+    Frontier cells none of the tiles not placed yet fits, from the placed tiles alone
+    """
+    placed = Counter(tile.tile_type for tile in state.map.placed_tiles)
+    unplaced = {t: count - placed[t] for t, count in TILE_COUNTS.items()}
+
+    return {
+        cell
+        for cell, constraint in state.map.frontier.items()
+        if not any(unplaced.get(t) for t in get_fitting(constraint))
+    }
+
+
+class TestDeadCells(unittest.TestCase):
+    """
+    Dead cells of each bot's state after every move of random games, against a
+    search of the frontier. Once dead a cell stays empty for the rest of the game
+    """
+
+    def check_dead_cells(self, state: ClientSate, query: QueryType) -> None:
+        self.assertEqual(state.map.dead_cells, find_dead_cells(state))
+
+        dead = self.dead.setdefault(id(state), set())
+        dead |= state.map.dead_cells
+
+        for x, y in dead:
+            self.assertTrue(state.map._grid.is_empty(x, y), (x, y))
+
+        self.checked += 1
+
+    def test_matches_search(self) -> None:
+        self.checked = 0
+
+        for seed in range(GAMES):
+            # States of a game are kept alive by it, their ids are not reused
+            self.dead: dict[int, set[tuple[int, int]]] = {}
+            play_random_game(seed, self.check_dead_cells)
+
+        self.assertGreater(self.checked, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
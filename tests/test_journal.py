@@ -0,0 +1,130 @@
+from helper.client_state import ClientSate
+
+from lib.interact.tile import Tile
+from lib.interact.tile_edges import EDGE_KEYS
+from lib.interface.queries.query_place_tile import QueryPlaceTile
+from lib.interface.queries.typing import QueryType
+
+from random_games import play_random_game
+
+from random import Random
+from typing import Hashable
+import unittest
+
+GAMES = 8
+
+
+def fingerprint(state: ClientSate) -> Hashable:
+    """
+    Map, frontier, structures, points and meeples of a state, tiles by identity
+    """
+    grid = state.map._grid
+
+    tiles = tuple(
+        (id(tile), tile.rotation, tile.placed_pos) for tile in state.map.placed_tiles
+    )
+    cells = tuple(
+        grid.get(*tile.placed_pos) is tile
+        for tile in state.map.placed_tiles
+        if tile.placed_pos is not None
+    )
+    frontier = tuple(
+        (pos, constraint, grid.is_empty(*pos))
+        for pos, constraint in sorted(state.map.frontier.items())
+    )
+
+    structures = []
+    claims = []
+    for tile in state.map.placed_tiles:
+        for edge in EDGE_KEYS:
+            component = state._get_component(tile, edge)
+            if component is not None:
+                structures.append(
+                    (
+                        id(component),
+                        component.nodes,
+                        component.open_edges,
+                        component.emblems,
+                        component.scored,
+                        frozenset(id(t) for t in component.tiles),
+                        tuple(
+                            (player_id, tuple(id(m) for m in meeples))
+                            for player_id, meeples in sorted(component.meeples.items())
+                        ),
+                    )
+                )
+
+        claims.append(
+            tuple(
+                None if meeple is None else (id(meeple), meeple.placed is tile)
+                for meeple in tile.internal_claims.values()
+            )
+        )
+
+    points = tuple(
+        (player_id, player.points)
+        for player_id, player in sorted(state.players.items())
+    )
+
+    return (
+        tiles,
+        cells,
+        frontier,
+        tuple(sorted(state.map.dead_cells)),
+        tuple(sorted(state.map.unplaced.items())),
+        tuple(structures),
+        tuple(claims),
+        points,
+        state.me.points,
+        tuple(sorted(state.players_meeples.items())),
+        state.me.num_meeples,
+        tuple((id(tile), tile.rotation, tile.placed_pos) for tile in state.my_tiles),
+        len(state.journal),
+    )
+
+
+class TestJournal(unittest.TestCase):
+    """
+    Random legal moves applied to a bot's state then all undone, before each of its
+    tile moves in random games, leave the state as it was
+    """
+
+    def try_moves(self, state: ClientSate, query: QueryType) -> None:
+        if not isinstance(query, QueryPlaceTile):
+            return
+
+        before = fingerprint(state)
+        player_id = state.me.player_id
+        depth = 0
+
+        while state.my_tiles:
+            moves = list(state.legal_tile_moves(state.my_tiles))
+            if not moves:
+                break
+
+            tile: Tile = state.apply_tile(state.my_tiles, self.rng.choice(moves))
+            depth += 1
+
+            edges = list(state.legal_meeple_moves(tile))
+            if edges and state.players_meeples[player_id] > 0:
+                state.apply_meeple(player_id, tile, self.rng.choice(edges))
+                depth += 1
+
+        for _ in range(depth):
+            state.undo()
+
+        self.assertEqual(fingerprint(state), before)
+        self.undone += depth
+
+    def test_undo_restores_state(self) -> None:
+        self.rng = Random(0)
+        self.undone = 0
+
+        for seed in range(GAMES):
+            play_random_game(seed, self.try_moves)
+
+        self.assertGreater(self.undone, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+from lib.interface.io.pipe_reader import MalformedSizeError
+from lib.interface.io.shared_ring import (
+    DOORBELL,
+    HEADER,
+    SIZE,
+    RingFullError,
+    SharedRing,
+    SharedRingReader,
+)
+
+import os
+import select
+import struct
+import unittest
+
+CAPACITY = 64
+
+
+class TestSharedRing(unittest.TestCase):
+    """
+    Messages through a ring and its reader, with the doorbell pipe the engine uses
+    """
+
+    def setUp(self) -> None:
+        self.ring = SharedRing.create(CAPACITY)
+        self.attached = SharedRing.attach(self.ring.name)
+
+        # Blocking, as the engine reads its pipes
+        read_fd, self.write_fd = os.pipe()
+        self.reader = SharedRingReader(read_fd, self.attached)
+
+    def tearDown(self) -> None:
+        os.close(self.write_fd)
+        self.reader.close()
+        self.ring.close()
+
+    def send(self, payload: bytes) -> None:
+        self.ring.push(payload)
+        os.write(self.write_fd, DOORBELL)
+
+    def receive(self) -> str:
+        return self.reader.read_payload(self.reader.read_size())
+
+    def assert_pipe_empty(self) -> None:
+        self.assertEqual(select.select([self.reader.fd], [], [], 0)[0], [])
+
+    def test_wraparound(self) -> None:
+        # Sizes that do not divide the capacity, so headers and payloads split
+        for i in range(50):
+            payload = bytes([i]) * (i % 13 + 1)
+            self.send(payload)
+            self.assertEqual(self.receive(), payload.decode())
+
+        self.assert_pipe_empty()
+
+    def test_full(self) -> None:
+        payload = b"x" * (CAPACITY // 2 - SIZE.size)
+        self.ring.push(payload)
+        self.ring.push(payload)
+
+        self.assertRaises(RingFullError, self.ring.push, b"x")
+
+        self.attached.pop()
+        self.ring.push(payload)
+        self.assertRaises(RingFullError, self.ring.push, b"x")
+
+    def test_clear(self) -> None:
+        for payload in (b"first", b"second", b"third"):
+            self.send(payload)
+
+        self.reader.discard()
+
+        self.assertIsNone(self.attached.peek_size())
+        self.assert_pipe_empty()
+
+        self.send(b"next")
+        self.assertEqual(self.receive(), "next")
+        self.assert_pipe_empty()
+
+    def test_one_doorbell_per_message(self) -> None:
+        self.send(b"first")
+        self.send(b"second")
+
+        self.assertEqual(self.receive(), "first")
+        self.assertEqual(self.receive(), "second")
+        self.assert_pipe_empty()
+
+    def test_malformed_size(self) -> None:
+        self.send(b"message")
+
+        # The only message starts the ring, its size claims more than was written
+        struct.pack_into("=I", self.ring.shm.buf, HEADER.size, CAPACITY)
+
+        self.assertRaises(MalformedSizeError, self.reader.read_size)
+        self.assertRaises(MalformedSizeError, self.attached.pop)
+
+
+if __name__ == "__main__":
+    unittest.main()
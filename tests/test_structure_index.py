@@ -0,0 +1,107 @@
+from helper.client_state import ClientSate
+
+from lib.interact.structure import StructureType
+from lib.interact.tile import Tile, TileModifier
+from lib.interact.tile_edges import EDGE_KEYS
+from lib.interface.queries.typing import QueryType
+
+from random_games import play_random_game
+
+from collections import deque
+import unittest
+
+GAMES = 12
+
+
+def traverse(state: ClientSate, start_tile: Tile, edge: str) -> set[tuple[Tile, str]]:
+    """
+    Breadth first search over the grid for every edge of a structure. Edges of a tile
+    connect as they are drawn, a road start edge ends its road within its tile
+    """
+    nodes: set[tuple[Tile, str]] = set()
+    queue = deque([(start_tile, edge)])
+
+    while queue:
+        tile, edge = queue.popleft()
+        if (tile, edge) in nodes:
+            continue
+
+        nodes.add((tile, edge))
+        structure_type = tile.internal_edges[edge]
+
+        connecting: list[str] = []
+        if structure_type != StructureType.ROAD_START:
+            if not (
+                structure_type == StructureType.CITY
+                and TileModifier.BROKEN_CITY in tile.modifiers
+            ):
+                connecting.extend(Tile.adjacent_edges(edge))
+
+            if TileModifier.get_bridge_modifier(structure_type) in tile.modifiers:
+                connecting.append(Tile.get_opposite(edge))
+
+        for other in connecting:
+            if tile.internal_edges[other] == structure_type:
+                queue.append((tile, other))
+
+        assert tile.placed_pos is not None
+        neighbour = Tile.get_external_tile(edge, tile.placed_pos, state.map._grid)
+        if neighbour is not None:
+            queue.append((neighbour, Tile.get_opposite(edge)))
+
+    return nodes
+
+
+class TestStructureIndex(unittest.TestCase):
+    """
+    The structure index against a search of the grid, after every move of random
+    games: components partition the same edges, with the same open edges and claims
+    """
+
+    def check_components(self, state: ClientSate, query: QueryType) -> None:
+        seen: set[tuple[Tile, str]] = set()
+
+        for tile in state.map.placed_tiles:
+            for edge in EDGE_KEYS:
+                component = state._get_component(tile, edge)
+                if component is None or (tile, edge) in seen:
+                    continue
+
+                nodes = traverse(state, tile, edge)
+                seen |= nodes
+
+                assert tile.placed_pos is not None
+                for node_tile, node_edge in nodes:
+                    self.assertIs(state._get_component(node_tile, node_edge), component)
+
+                self.assertEqual(component.tiles, {t for t, _ in nodes})
+                self.assertEqual(
+                    component.open_edges,
+                    sum(
+                        Tile.get_external_tile(e, t.placed_pos, state.map._grid) is None
+                        for t, e in nodes
+                        if t.placed_pos is not None
+                    ),
+                )
+                self.assertCountEqual(
+                    [m for meeples in component.meeples.values() for m in meeples],
+                    [
+                        t.internal_claims[e]
+                        for t, e in nodes
+                        if t.internal_claims[e] is not None
+                    ],
+                )
+
+                self.checked += 1
+
+    def test_matches_search(self) -> None:
+        self.checked = 0
+
+        for seed in range(GAMES):
+            play_random_game(seed, self.check_components)
+
+        self.assertGreater(self.checked, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
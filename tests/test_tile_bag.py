@@ -0,0 +1,109 @@
+from helper.client_state import ClientSate
+
+from lib.game.tile_bag import TileBag
+from lib.interact.tile import create_base_tiles
+from lib.interface.queries.query_place_tile import QueryPlaceTile
+from lib.interface.queries.typing import QueryType
+
+from random_games import play_random_game
+
+from collections import Counter
+from copy import deepcopy
+from random import Random
+import unittest
+
+DRAWS = 20000
+
+
+class TestTileBag(unittest.TestCase):
+    """
+    Draws, takes and copies of the bag, checked against the tiles it was given
+    """
+
+    def check_consistent(self, bag: TileBag) -> None:
+        tiles = list(bag)
+
+        self.assertEqual(len(bag), len(tiles))
+        self.assertEqual(len(set(map(id, tiles))), len(tiles))
+
+        for slot, tile in enumerate(tiles):
+            self.assertEqual(bag._slots[tile], slot)
+
+        counts = Counter(tile.tile_type for tile in tiles)
+        self.assertEqual({t: n for t, n in bag.counts.items() if n}, dict(counts))
+
+        for tile_type, count in counts.items():
+            self.assertEqual(len(bag._by_type[tile_type]), count)
+            self.assertEqual(bag.peek(tile_type).tile_type, tile_type)
+
+    def test_take_keeps_slots(self) -> None:
+        rng = Random(0)
+        bag = TileBag(create_base_tiles())
+
+        while bag:
+            tile_type = rng.choice([t for t, n in bag.counts.items() if n])
+            peeked = bag.peek(tile_type)
+
+            self.assertIs(bag.take(tile_type), peeked)
+            self.check_consistent(bag)
+
+        self.assertEqual(bag.get_probability("A"), 0.0)
+
+    def test_draw_keeps_slots(self) -> None:
+        rng = Random(1)
+        bag = TileBag(create_base_tiles())
+        total = len(bag)
+
+        drawn = []
+        while len(bag) > 3:
+            drawn.extend(bag.draw(rng, 3))
+            self.check_consistent(bag)
+
+        self.assertEqual(len(drawn) + len(bag), total)
+        self.assertRaises(ValueError, bag.draw, rng, 4)
+
+    def test_draws_are_uniform(self) -> None:
+        rng = Random(2)
+        tiles = create_base_tiles()
+        expected = Counter(tile.tile_type for tile in tiles)
+
+        seen: Counter[str] = Counter()
+        for _ in range(DRAWS):
+            bag = TileBag(tiles)
+            seen[bag.draw(rng)[0].tile_type] += 1
+
+        for tile_type, count in expected.items():
+            probability = count / len(tiles)
+            # Within 5 standard deviations of the binomial count
+            spread = 5 * (DRAWS * probability * (1 - probability)) ** 0.5
+            self.assertAlmostEqual(seen[tile_type], DRAWS * probability, delta=spread)
+
+    def test_deepcopy_state(self) -> None:
+        checked = 0
+
+        def copy_state(state: ClientSate, query: QueryType) -> None:
+            nonlocal checked
+            if not isinstance(query, QueryPlaceTile) or not state.map.available_tiles:
+                return
+
+            copied = deepcopy(state)
+            bag = state.map.available_tiles
+            copied_bag = copied.map.available_tiles
+            left = len(bag)
+
+            self.assertEqual(dict(copied_bag.counts), dict(bag.counts))
+
+            (tile,) = copied_bag.draw(Random(checked))
+            self.assertNotIn(tile, set(bag))
+            self.assertEqual(len(copied_bag), left - 1)
+            self.assertEqual(len(bag), left)
+            self.check_consistent(copied_bag)
+
+            checked += 1
+
+        play_random_game(0, copy_state)
+        self.assertGreater(checked, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
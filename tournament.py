@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import combinations
+from signal import SIGKILL
+from typing import Any
+
+from match_simulator import (
+    NUM_PLAYERS,
+    BotPool,
+    setup_environments,
+    start_engine,
+    start_submissions,
+)
+
+
+def main():
+    # python3 tournament.py --submissions a.py b.py c.py d.py e.py --schedule round_robin --rounds 2
+
+    args = parse_cmd_args()
+
+    if args.schedule == "round_robin":
+        schedule = round_robin_schedule(args.submissions, args.rounds)
+    else:
+        schedule = random_schedule(args.submissions, args.matches, args.seed)
+
+    print(
+        f"[tournament]: {len(schedule)} matches over {args.workers} workers.",
+        flush=True,
+    )
+
+    pool = BotPool() if args.pool else None
+
+    matches: list[dict[str, Any]] = [{} for _ in schedule]
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(
+                run_match,
+                lineup,
+                args.keep,
+                pool,
+                None if args.seed is None else args.seed + i,
+            ): i
+            for i, lineup in enumerate(schedule)
+        }
+
+        for completed, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            matches[i] = {"match": i, "players": schedule[i], **future.result()}
+            print(
+                f"[tournament]: match {i} complete ({completed}/{len(schedule)}), "
+                f"outcome was {matches[i]['result']['result_type']}",
+                flush=True,
+            )
+
+    if pool is not None:
+        pool.close()
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "schedule": args.schedule,
+                "standings": get_standings(matches),
+                "matches": matches,
+            },
+            f,
+            indent=2,
+        )
+
+    print(f"[tournament]: results written to {args.output}.")
+
+
+def parse_cmd_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Runs a ladder of matches in parallel, each match in its own directory."
+    )
+    parser.add_argument(
+        "--submissions",
+        nargs="+",
+        required=True,
+        help="Source files of the submissions in the roster.",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=["round_robin", "random"],
+        default="round_robin",
+        help="round_robin plays every lineup of distinct submissions, random draws lineups.",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=1,
+        help="Number of times each round robin lineup is played.",
+    )
+    parser.add_argument(
+        "--matches",
+        type=int,
+        default=100,
+        help="Number of random lineups to play.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for random lineups, match i is played with engine seed + i.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of matches running at once, defaults to one per core.",
+    )
+    parser.add_argument(
+        "--output",
+        default="tournament_results.json",
+        help="Aggregate results file.",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the match directories instead of removing them.",
+    )
+    parser.add_argument(
+        "--pool",
+        action="store_true",
+        help="Reuse warm bot processes across matches, see helper.worker.",
+    )
+
+    args = parser.parse_args()
+
+    if args.schedule == "round_robin" and len(args.submissions) < NUM_PLAYERS:
+        parser.error(
+            f"round_robin needs at least {NUM_PLAYERS} submissions, use --schedule random."
+        )
+
+    return args
+
+
+def round_robin_schedule(roster: list[str], rounds: int) -> list[list[str]]:
+    return [
+        list(lineup)
+        for _ in range(rounds)
+        for lineup in combinations(roster, NUM_PLAYERS)
+    ]
+
+
+def random_schedule(
+    roster: list[str], matches: int, seed: int | None
+) -> list[list[str]]:
+    rng = random.Random(seed)
+
+    # Submissions may play themselves when the roster is too small for a match
+    if len(roster) < NUM_PLAYERS:
+        return [rng.choices(roster, k=NUM_PLAYERS) for _ in range(matches)]
+
+    return [rng.sample(roster, NUM_PLAYERS) for _ in range(matches)]
+
+
+def run_match(
+    lineup: list[str], keep: bool, pool: BotPool | None, seed: int | None = None
+) -> dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="carcassonne_match_")
+    submission_pids: list[int] = []
+    workers = []
+
+    try:
+        setup_environments([(1, source) for source in lineup], directory)
+
+        if pool is not None:
+            workers = pool.start_submissions(lineup, directory)
+        else:
+            submission_pids = start_submissions(directory, verbose=False)
+
+        start_engine(directory, verbose=False, seed=seed)
+
+        try:
+            with open(f"{directory}/output/results.json", "r") as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            result = {
+                "result_type": "CRASHED",
+                "reason": "Game engine did not write a result.",
+            }
+
+    finally:
+        if pool is not None:
+            pool.release(lineup, workers)
+
+        for pid in submission_pids:
+            try:
+                os.kill(pid, SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+
+        if not keep:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return {"result": result, "directory": directory if keep else None}
+
+
+def get_standings(matches: list[dict[str, Any]]) -> dict[str, dict[str, int]]:
+    standings: dict[str, dict[str, int]] = {}
+
+    for match in matches:
+        result = match["result"]
+
+        for seat, source in enumerate(match["players"]):
+            standing = standings.setdefault(
+                source, {"matches": 0, "wins": 0, "points": 0, "bans": 0}
+            )
+            standing["matches"] += 1
+
+            match result["result_type"]:
+                case "SUCCESS":
+                    standing["points"] += result["score"][str(seat)]
+                    if result["ranking"][0] == seat:
+                        standing["wins"] += 1
+
+                case "PLAYER_BANNED" if result["player"] == seat:
+                    standing["bans"] += 1
+
+    return dict(sorted(standings.items(), key=lambda x: x[1]["wins"], reverse=True))
+
+
+if __name__ == "__main__":
+    main()